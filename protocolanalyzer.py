@@ -26,16 +26,22 @@ Date: January 25, 2026
 License: MIT
 """
 
-import argparse
-import json
+import heapq
 import os
 import re
+import stat
 import sys
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Set, Any
-from datetime import datetime
-from collections import defaultdict
+from types import SimpleNamespace
+from typing import Dict, Iterator, List, Optional, Tuple, Set, Any, Union
+from collections import Counter
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+
+# argparse, json, hashlib, datetime and concurrent.futures are imported
+# where they are used, so commands that never reach them (list, migrate,
+# text output) start faster
 
 
 # ============================================================================
@@ -45,6 +51,13 @@ from collections import defaultdict
 @dataclass
 class ProtocolDetection:
     """Represents a detected protocol in the codebase."""
+    # Explicit __slots__ (dataclass(slots=True) needs Python 3.10+): large
+    # scans create one instance per match, so skipping __dict__ adds up
+    __slots__ = (
+        'protocol', 'file_path', 'line_number', 'pattern_matched',
+        'confidence', 'context'
+    )
+    
     protocol: str
     file_path: str
     line_number: int
@@ -53,22 +66,34 @@ class ProtocolDetection:
     context: str  # Code snippet around detection
 
 
-@dataclass
+@dataclass(frozen=True)
 class ProtocolInfo:
     """Information about a communication protocol."""
+    # Read-only reference data shared by every analysis (and rebuilt in
+    # every worker process), so it is frozen and holds tuples
+    __slots__ = (
+        'name', 'category', 'complexity_base', 'dependencies', 'pros',
+        'cons', 'typical_use_cases', 'compatibility_notes'
+    )
+    
     name: str
     category: str  # realtime, request-response, streaming, rpc
     complexity_base: int  # Base complexity score (1-10)
-    dependencies: List[str]
-    pros: List[str]
-    cons: List[str]
-    typical_use_cases: List[str]
+    dependencies: Tuple[str, ...]
+    pros: Tuple[str, ...]
+    cons: Tuple[str, ...]
+    typical_use_cases: Tuple[str, ...]
     compatibility_notes: Dict[str, str]
 
 
 @dataclass
 class ProjectProtocol:
     """A protocol detected in the project."""
+    __slots__ = (
+        'name', 'detections', 'total_lines', 'file_count',
+        'complexity_score', 'is_client', 'is_server'
+    )
+    
     name: str
     detections: List[ProtocolDetection]
     total_lines: int
@@ -81,6 +106,11 @@ class ProjectProtocol:
 @dataclass
 class ProtocolRecommendation:
     """A protocol recommendation with rationale."""
+    __slots__ = (
+        'protocol', 'score', 'rationale', 'pros', 'cons',
+        'migration_complexity', 'estimated_time'
+    )
+    
     protocol: str
     score: float  # 0-100, higher is better recommendation
     rationale: List[str]
@@ -103,6 +133,60 @@ class AnalysisResult:
     warnings: List[str]
 
 
+def _detection_dict(d: ProtocolDetection) -> Dict[str, Any]:
+    """Return the same dict as ``asdict(d)``."""
+    return {
+        'protocol': d.protocol,
+        'file_path': d.file_path,
+        'line_number': d.line_number,
+        'pattern_matched': d.pattern_matched,
+        'confidence': d.confidence,
+        'context': d.context
+    }
+
+
+def _result_dict(result: AnalysisResult) -> Dict[str, Any]:
+    """
+    Return the same dict as ``asdict(result)``, several times faster.
+    
+    asdict() inspects every field of every nested dataclass and deep-copies
+    each value, which dominates serializing a result holding thousands of
+    detections. Keep these field lists in step with the classes above.
+    """
+    return {
+        'project_path': result.project_path,
+        'timestamp': result.timestamp,
+        'detected_protocols': [
+            {
+                'name': p.name,
+                'detections': [_detection_dict(d) for d in p.detections],
+                'total_lines': p.total_lines,
+                'file_count': p.file_count,
+                'complexity_score': p.complexity_score,
+                'is_client': p.is_client,
+                'is_server': p.is_server
+            }
+            for p in result.detected_protocols
+        ],
+        'architecture_type': result.architecture_type,
+        'complexity_total': result.complexity_total,
+        'recommendations': [
+            {
+                'protocol': r.protocol,
+                'score': r.score,
+                'rationale': list(r.rationale),
+                'pros': list(r.pros),
+                'cons': list(r.cons),
+                'migration_complexity': r.migration_complexity,
+                'estimated_time': r.estimated_time
+            }
+            for r in result.recommendations
+        ],
+        'summary': result.summary,
+        'warnings': list(result.warnings)
+    }
+
+
 # ============================================================================
 # PROTOCOL DATABASE
 # ============================================================================
@@ -112,25 +196,25 @@ PROTOCOLS_DB: Dict[str, ProtocolInfo] = {
         name="WebSocket",
         category="realtime",
         complexity_base=3,
-        dependencies=["websockets", "ws", "websocket-client"],
-        pros=[
+        dependencies=("websockets", "ws", "websocket-client"),
+        pros=(
             "Full-duplex communication",
             "Low overhead after handshake",
             "Standardized (RFC 6455)",
             "Wide browser support",
             "Simple API"
-        ],
-        cons=[
+        ),
+        cons=(
             "No automatic reconnection",
             "No built-in message acknowledgment",
             "Manual room/namespace management"
-        ],
-        typical_use_cases=[
+        ),
+        typical_use_cases=(
             "Real-time chat",
             "Live updates",
             "Gaming",
             "Streaming data"
-        ],
+        ),
         compatibility_notes={
             "browser": "Native support in all modern browsers",
             "python": "websockets, websocket-client libraries",
@@ -141,26 +225,26 @@ PROTOCOLS_DB: Dict[str, ProtocolInfo] = {
         name="Socket.IO",
         category="realtime",
         complexity_base=6,
-        dependencies=["socket.io", "socket.io-client", "python-socketio", "socketio"],
-        pros=[
+        dependencies=("socket.io", "socket.io-client", "python-socketio", "socketio"),
+        pros=(
             "Automatic reconnection",
             "Room/namespace support",
             "Binary support",
             "Fallback to HTTP long-polling",
             "Event-based API"
-        ],
-        cons=[
+        ),
+        cons=(
             "Higher overhead than WebSocket",
             "Version compatibility issues (v2/v3/v4)",
             "Requires matching client/server versions",
             "Not standard protocol"
-        ],
-        typical_use_cases=[
+        ),
+        typical_use_cases=(
             "Complex real-time apps",
             "Chat with rooms",
             "Collaborative editing",
             "Real-time dashboards"
-        ],
+        ),
         compatibility_notes={
             "browser": "Requires socket.io-client library",
             "python": "python-socketio (note version compatibility)",
@@ -172,25 +256,25 @@ PROTOCOLS_DB: Dict[str, ProtocolInfo] = {
         name="HTTP/REST",
         category="request-response",
         complexity_base=2,
-        dependencies=["requests", "httpx", "aiohttp", "fetch", "axios"],
-        pros=[
+        dependencies=("requests", "httpx", "aiohttp", "fetch", "axios"),
+        pros=(
             "Universal support",
             "Stateless and cacheable",
             "Simple to debug",
             "Works through proxies/firewalls",
             "Well-understood patterns"
-        ],
-        cons=[
+        ),
+        cons=(
             "No server push (without polling)",
             "Higher latency for real-time",
             "Connection overhead per request"
-        ],
-        typical_use_cases=[
+        ),
+        typical_use_cases=(
             "CRUD APIs",
             "Microservices",
             "Public APIs",
             "Traditional web apps"
-        ],
+        ),
         compatibility_notes={
             "browser": "Native fetch API",
             "python": "requests, httpx, aiohttp",
@@ -201,22 +285,22 @@ PROTOCOLS_DB: Dict[str, ProtocolInfo] = {
         name="HTTP Long-Polling",
         category="request-response",
         complexity_base=4,
-        dependencies=["requests", "httpx", "aiohttp"],
-        pros=[
+        dependencies=("requests", "httpx", "aiohttp"),
+        pros=(
             "Works everywhere HTTP works",
             "No WebSocket support needed",
             "Simple server implementation"
-        ],
-        cons=[
+        ),
+        cons=(
             "Higher server load",
             "Not truly real-time",
             "Resource intensive for many clients"
-        ],
-        typical_use_cases=[
+        ),
+        typical_use_cases=(
             "Legacy browser support",
             "Firewall-restricted environments",
             "Simple notification systems"
-        ],
+        ),
         compatibility_notes={
             "browser": "Works with any HTTP client",
             "python": "Standard HTTP libraries",
@@ -227,25 +311,25 @@ PROTOCOLS_DB: Dict[str, ProtocolInfo] = {
         name="gRPC",
         category="rpc",
         complexity_base=7,
-        dependencies=["grpcio", "grpc", "protobuf", "@grpc/grpc-js"],
-        pros=[
+        dependencies=("grpcio", "grpc", "protobuf", "@grpc/grpc-js"),
+        pros=(
             "High performance (HTTP/2)",
             "Strongly typed with protobuf",
             "Bidirectional streaming",
             "Code generation"
-        ],
-        cons=[
+        ),
+        cons=(
             "Browser support limited (grpc-web)",
             "Requires protobuf knowledge",
             "More complex setup",
             "Binary protocol harder to debug"
-        ],
-        typical_use_cases=[
+        ),
+        typical_use_cases=(
             "Microservices communication",
             "High-performance APIs",
             "Mobile backends",
             "Service mesh"
-        ],
+        ),
         compatibility_notes={
             "browser": "Requires grpc-web proxy",
             "python": "grpcio library",
@@ -256,26 +340,26 @@ PROTOCOLS_DB: Dict[str, ProtocolInfo] = {
         name="GraphQL",
         category="request-response",
         complexity_base=5,
-        dependencies=["graphql", "graphene", "apollo", "strawberry", "@apollo/client"],
-        pros=[
+        dependencies=("graphql", "graphene", "apollo", "strawberry", "@apollo/client"),
+        pros=(
             "Flexible queries",
             "No over-fetching",
             "Strong typing",
             "Introspection",
             "Single endpoint"
-        ],
-        cons=[
+        ),
+        cons=(
             "Learning curve",
             "Complex caching",
             "N+1 query problem",
             "More server complexity"
-        ],
-        typical_use_cases=[
+        ),
+        typical_use_cases=(
             "Complex data relationships",
             "Mobile apps (bandwidth optimization)",
             "Evolving APIs",
             "Frontend-driven development"
-        ],
+        ),
         compatibility_notes={
             "browser": "Apollo Client, urql",
             "python": "graphene, strawberry",
@@ -286,24 +370,24 @@ PROTOCOLS_DB: Dict[str, ProtocolInfo] = {
         name="Server-Sent Events (SSE)",
         category="streaming",
         complexity_base=2,
-        dependencies=["aiohttp", "flask", "fastapi"],
-        pros=[
+        dependencies=("aiohttp", "flask", "fastapi"),
+        pros=(
             "Simple one-way streaming",
             "Built on HTTP",
             "Automatic reconnection",
             "Native browser support"
-        ],
-        cons=[
+        ),
+        cons=(
             "One-way only (server to client)",
             "Text-based only",
             "Limited browser connections"
-        ],
-        typical_use_cases=[
+        ),
+        typical_use_cases=(
             "News feeds",
             "Stock tickers",
             "Progress updates",
             "Notifications"
-        ],
+        ),
         compatibility_notes={
             "browser": "Native EventSource API",
             "python": "Built into web frameworks",
@@ -314,24 +398,24 @@ PROTOCOLS_DB: Dict[str, ProtocolInfo] = {
         name="MQTT",
         category="realtime",
         complexity_base=5,
-        dependencies=["paho-mqtt", "mqtt", "mosquitto"],
-        pros=[
+        dependencies=("paho-mqtt", "mqtt", "mosquitto"),
+        pros=(
             "Very lightweight",
             "Publish/subscribe pattern",
             "QoS levels",
             "Great for IoT"
-        ],
-        cons=[
+        ),
+        cons=(
             "Requires broker",
             "Not browser-native",
             "Different paradigm"
-        ],
-        typical_use_cases=[
+        ),
+        typical_use_cases=(
             "IoT devices",
             "Sensor data",
             "Home automation",
             "Low-bandwidth environments"
-        ],
+        ),
         compatibility_notes={
             "browser": "Requires MQTT over WebSocket",
             "python": "paho-mqtt",
@@ -341,10 +425,39 @@ PROTOCOLS_DB: Dict[str, ProtocolInfo] = {
 }
 
 
+def _normalize_protocol_name(name: str) -> str:
+    """Normalize a user-supplied protocol name for alias lookup."""
+    return name.lower().replace(' ', '_').replace('-', '_')
+
+
+def _build_protocol_aliases(db: Dict[str, ProtocolInfo]) -> Dict[str, str]:
+    """
+    Map every accepted spelling of a protocol (its key, the key with '.' as
+    '_', and its display name), normalized, to its PROTOCOLS_DB key.
+    """
+    aliases: Dict[str, str] = {}
+    for key, info in db.items():
+        for alias in (key, key.replace('.', '_'), info.name):
+            aliases.setdefault(_normalize_protocol_name(alias), key)
+    return aliases
+
+
+_PROTOCOL_ALIASES = _build_protocol_aliases(PROTOCOLS_DB)
+
+# PROTOCOLS_DB is static, so the `list` command's sorted views are built once
+_SORTED_PROTOCOLS: List[Tuple[str, ProtocolInfo]] = sorted(PROTOCOLS_DB.items())
+_PROTOCOLS_BY_CATEGORY: Dict[str, List[Tuple[str, ProtocolInfo]]] = {
+    category: [(key, info) for key, info in _SORTED_PROTOCOLS if info.category == category]
+    for category in ('realtime', 'request-response', 'streaming', 'rpc')
+}
+
+
 # ============================================================================
 # DETECTION PATTERNS
 # ============================================================================
 
+# Kept as plain lists so projects can add their own (pattern, confidence)
+# entries; the scanner compiles its own immutable copy
 DETECTION_PATTERNS: Dict[str, List[Tuple[str, float]]] = {
     "websocket": [
         (r"new\s+WebSocket\s*\(", 0.95),
@@ -424,6 +537,287 @@ DETECTION_PATTERNS: Dict[str, List[Tuple[str, float]]] = {
 }
 
 
+# Newline-free replacements for escapes that would otherwise match "\n"
+_LINE_BOUNDED_ESCAPES = {r'\s': r'[^\S\n]', r'\W': r'[^\w\n]', r'\D': r'[^\d\n]'}
+
+
+def _line_bounded(pattern: str) -> str:
+    """
+    Rewrite a detection pattern so it cannot match across a newline.
+    
+    Outside a character class ``\\s``, ``\\W`` and ``\\D`` become sets that
+    exclude ``\\n``. Inside a class ``\\s`` is spelled out as the other
+    (ASCII) whitespace characters, and negated classes also exclude ``\\n``.
+    A class holding ``\\W`` or ``\\D`` becomes a group of alternatives, so
+    ``[\\W_]`` is matched as ``(?:[_]|[^\\w\\n])``.
+    """
+    out = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            escape = pattern[i:i + 2]
+            out.append(_LINE_BOUNDED_ESCAPES.get(escape, escape))
+            i += 2
+            continue
+        if char != '[':
+            out.append(char)
+            i += 1
+            continue
+        
+        start = i
+        i += 1
+        negated = pattern.startswith('^', i)
+        if negated:
+            i += 1
+        first = i
+        members = []
+        sets = []  # Line-bounded stand-ins for \W and \D
+        # A ']' straight after '[' or '[^' is a literal member
+        while i < len(pattern) and (pattern[i] != ']' or i == first):
+            if pattern[i] != '\\':
+                members.append(pattern[i])
+                i += 1
+                continue
+            escape = pattern[i:i + 2]
+            i += 2
+            if negated:
+                members.append(escape)
+            elif escape == r'\s':
+                members.append(r' \t\r\f\v')
+            elif escape in (r'\W', r'\D'):
+                sets.append(_LINE_BOUNDED_ESCAPES[escape])
+            else:
+                members.append(escape)
+        if i >= len(pattern):
+            # Unterminated class: leave it for re.compile to report
+            out.append(pattern[start:])
+            break
+        i += 1
+        
+        members = ''.join(members)
+        if negated:
+            out.append('[^' + members + r'\n]')
+        elif not sets:
+            out.append('[' + members + ']')
+        else:
+            if members.startswith('^'):
+                members = '\\' + members
+            alternatives = (['[' + members + ']'] if members else []) + sets
+            out.append('(?:' + '|'.join(alternatives) + ')')
+    return ''.join(out)
+
+
+def _lowercase_pattern(pattern: str) -> str:
+    """
+    Lowercase the literal characters of a pattern, leaving escapes such as
+    ``\\S`` or ``\\W`` untouched, so it can be matched case-sensitively
+    against lowercased text with the same result as ``re.IGNORECASE``.
+    """
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern[i] == '\\':
+            out.append(pattern[i:i + 2])
+            i += 2
+        else:
+            out.append(pattern[i].lower())
+            i += 1
+    return ''.join(out)
+
+
+def _required_literals(pattern: str, min_length: int = 3) -> Tuple[bytes, ...]:
+    """
+    Extract lowercase literal anchors that any match of ``pattern`` must contain.
+    
+    Returns one literal per top-level alternative (the longest fixed run of
+    characters in it), or an empty tuple when some alternative has no literal
+    of at least ``min_length`` characters and so cannot be prefiltered.
+    """
+    alternatives = []
+    depth = 0
+    current = ''
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == '\\':
+            current += pattern[i:i + 2]
+            i += 2
+            continue
+        if c in '([':
+            depth += 1
+        elif c in ')]':
+            depth -= 1
+        elif c == '|' and depth == 0:
+            alternatives.append(current)
+            current = ''
+            i += 1
+            continue
+        current += c
+        i += 1
+    alternatives.append(current)
+    
+    literals = []
+    for alternative in alternatives:
+        runs = ['']
+        i = 0
+        while i < len(alternative):
+            c = alternative[i]
+            if c == '\\':
+                nxt = alternative[i + 1]
+                char = None if nxt.isalnum() else nxt  # \s, \b, \d, ...
+                i += 2
+            elif c in '([':
+                # Skip the whole group or character class
+                close = ')' if c == '(' else ']'
+                depth = 0
+                while i < len(alternative):
+                    if alternative[i] == '\\':
+                        i += 2
+                        continue
+                    if alternative[i] == c:
+                        depth += 1
+                    elif alternative[i] == close:
+                        depth -= 1
+                        if depth == 0:
+                            break
+                    i += 1
+                char = None
+                i += 1
+            elif c in '.^$':
+                char = None
+                i += 1
+            else:
+                char = c
+                i += 1
+                
+            quantifier = alternative[i] if i < len(alternative) else ''
+            if quantifier in ('*', '?', '{'):
+                # Optional or variable repetition - the atom is not required
+                while i < len(alternative) and alternative[i] != '}' and quantifier == '{':
+                    i += 1
+                i += 1
+                if i < len(alternative) and alternative[i] == '?':
+                    i += 1
+                char = None
+            elif quantifier == '+':
+                i += 1
+                if char is not None:
+                    runs[-1] += char
+                char = None
+                
+            if char is None:
+                runs.append('')
+            else:
+                runs[-1] += char
+                
+        longest = max(runs, key=len)
+        if len(longest) < min_length:
+            return ()
+        literals.append(longest.lower().encode('ascii'))
+    return tuple(literals)
+
+
+# protocol -> (protocol literals, [(regex, pattern, confidence, literals)])
+_CompiledPatterns = Dict[str, Tuple[Tuple[bytes, ...], List[Tuple["re.Pattern", str, float, Tuple[bytes, ...]]]]]
+
+
+def _compile_detection_patterns(
+    patterns: Dict[str, List[Tuple[str, float]]]
+) -> _CompiledPatterns:
+    """
+    Compile a detection pattern table for the scanner.
+
+    Every pattern is compiled on its own so each (pattern, line) hit is
+    reported with its own confidence.
+    
+    Patterns are compiled as ``bytes`` so files can be matched without
+    decoding them first, which means they must be ASCII; a non-ASCII pattern
+    raises ``ValueError``. In bytes mode ``\\w`` and ``\\b`` are ASCII-only
+    too, so ``\\bgrpc\\b`` also matches inside ``égrpc``. They run over whole
+    file contents, so ``_line_bounded`` keeps newlines out of them - a match must
+    never span two lines - and ``re.MULTILINE`` makes ``^`` and ``$`` anchor at
+    each line, as they did when files were scanned line by line (content is
+    CR-normalised first). They are lowercased and matched case-sensitively
+    against the lowercased file: ``re.IGNORECASE`` disables the engine's
+    literal-prefix search and is several times slower.
+    
+    Alongside each regex sits the tuple of literals a match must contain (see
+    ``_required_literals``), so the scanner can skip regexes whose anchors do
+    not occur in a file at all. The protocol-level tuple is the union of its
+    patterns' literals, or empty if any pattern has none.
+    """
+    compiled = {}
+    for protocol, entries in patterns.items():
+        for pattern, _ in entries:
+            if not pattern.isascii():
+                raise ValueError(
+                    f"Detection pattern {pattern!r} for {protocol!r} is not ASCII"
+                )
+        individual = [
+            (
+                re.compile(
+                    _lowercase_pattern(_line_bounded(pattern)).encode('ascii'),
+                    re.MULTILINE
+                ),
+                pattern,
+                confidence,
+                _required_literals(pattern)
+            )
+            for pattern, confidence in entries
+        ]
+        if all(literals for _, _, _, literals in individual):
+            protocol_literals = tuple(
+                literal for _, _, _, literals in individual for literal in literals
+            )
+        else:
+            protocol_literals = ()
+        # Interned so every detection, summary key and PROTOCOLS_DB lookup
+        # compares protocol names by identity first
+        compiled[sys.intern(protocol)] = (protocol_literals, individual)
+    return compiled
+
+
+def _freeze_patterns(
+    patterns: Dict[str, List[Tuple[str, float]]]
+) -> Tuple[Tuple[str, Tuple[Tuple[str, float], ...]], ...]:
+    """Return a hashable snapshot of a detection pattern table's contents."""
+    return tuple(
+        (protocol, tuple(map(tuple, entries))) for protocol, entries in patterns.items()
+    )
+
+
+@lru_cache(maxsize=8)
+def _compile_frozen_patterns(
+    frozen: Tuple[Tuple[str, Tuple[Tuple[str, float], ...]], ...]
+) -> _CompiledPatterns:
+    """Compile a frozen pattern table (see ``_freeze_patterns``) once per content."""
+    return _compile_detection_patterns(dict(frozen))
+
+
+def _compiled_patterns(
+    patterns: Optional[Dict[str, List[Tuple[str, float]]]] = None
+) -> _CompiledPatterns:
+    """
+    Return the compiled form of ``patterns`` (default: DETECTION_PATTERNS).
+    
+    Compiling happens on first use rather than at import, so commands that
+    never scan (list, compare, migrate, or an analyze served from the cached
+    result) skip it. The cache is keyed on the table's contents: patterns
+    added to DETECTION_PATTERNS after an earlier scan take effect on the next.
+    """
+    if patterns is None:
+        patterns = DETECTION_PATTERNS
+    return _compile_frozen_patterns(_freeze_patterns(patterns))
+
+
+def __getattr__(name: str) -> Any:
+    """Build ``COMPILED_PATTERNS`` when it is first accessed (PEP 562)."""
+    if name == 'COMPILED_PATTERNS':
+        return _compiled_patterns()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # Client vs Server patterns
 CLIENT_PATTERNS = [
     r"connect\s*\(",
@@ -447,11 +841,353 @@ SERVER_PATTERNS = [
     r"bind\s*\(",
 ]
 
+# Each role list folded into one alternation, checked once per detection
+_CLIENT_RE = re.compile('|'.join(f'(?:{p})' for p in CLIENT_PATTERNS), re.IGNORECASE)
+_SERVER_RE = re.compile('|'.join(f'(?:{p})' for p in SERVER_PATTERNS), re.IGNORECASE)
+
+
+# ============================================================================
+# SCAN CACHE
+# ============================================================================
+
+class CacheStore:
+    """
+    Persist per-file detections between runs.
+    
+    Entries are keyed by file path and stamped with the file's
+    ``(mtime_ns, size)``; a file whose stamp is unchanged is not rescanned.
+    The last full analysis result is kept too, keyed by a hash of every
+    file's stamp, so an untouched tree is not analyzed again at all.
+    The whole cache is discarded when the detection patterns change.
+    """
+    
+    FILENAME = '.protocolanalyzer_cache.json'
+    
+    # Bump when the scan or analysis logic changes in a way that alters
+    # detections or results
+    VERSION = 3
+    
+    def __init__(self, path: Path, settings: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the store.
+        
+        Args:
+            path: Location of the JSON cache file
+            settings: Scan options that affect detections (e.g. size limit);
+                      a change to any of them invalidates the cache
+        """
+        self.path = path
+        self.settings = settings or {}
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._seen: Dict[str, Dict[str, Any]] = {}
+        self._result: Optional[Dict[str, Any]] = None
+        
+    def _fingerprint(self) -> str:
+        """Hash of the patterns and settings the cached results were built with."""
+        import hashlib
+        import json
+        
+        return hashlib.sha1(
+            json.dumps([DETECTION_PATTERNS, self.settings], sort_keys=True).encode('utf-8')
+        ).hexdigest()
+    
+    def load(self) -> None:
+        """Load cached entries, ignoring a missing, corrupt or stale file."""
+        import json
+        
+        self._entries = {}
+        self._seen = {}
+        self._result = None
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+            
+        if (isinstance(data, dict)
+                and data.get('version') == self.VERSION
+                and data.get('patterns') == self._fingerprint()):
+            files = data.get('files')
+            result = data.get('result')
+            self._entries = files if isinstance(files, dict) else {}
+            self._result = result if isinstance(result, dict) else None
+    
+    def save(self) -> None:
+        """Write back the entries for files seen since the last load."""
+        import json
+        
+        data = {
+            'version': self.VERSION,
+            'patterns': self._fingerprint(),
+            'files': self._seen,
+            'result': self._result
+        }
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        try:
+            # json.dumps encodes in C; json.dump streams through the
+            # pure-Python encoder, several times slower on a large cache
+            text = json.dumps(data)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass  # Read-only project - caching is best effort
+    
+    def get(
+        self,
+        file_path: str,
+        stamp: Tuple[int, int]
+    ) -> Optional[List[ProtocolDetection]]:
+        """Return cached detections for an unchanged file, or None."""
+        entry = self._entries.get(file_path)
+        if entry is None:
+            return None
+        # Share interned path, protocol and pattern strings instead of one
+        # copy per decoded entry
+        fp_str = sys.intern(file_path)
+        intern = sys.intern
+        try:
+            if tuple(entry['stamp']) != stamp:
+                return None
+            detections = [
+                ProtocolDetection(**dict(
+                    d,
+                    file_path=fp_str,
+                    protocol=intern(d['protocol']),
+                    pattern_matched=intern(d['pattern_matched'])
+                ))
+                for d in entry['detections']
+            ]
+        except (KeyError, TypeError, ValueError):
+            # A malformed (e.g. hand-edited) entry is a miss; it is not
+            # written back, so the rescan replaces it
+            del self._entries[file_path]
+            return None
+        self._seen[file_path] = entry
+        return detections
+    
+    def put(
+        self,
+        file_path: str,
+        stamp: Tuple[int, int],
+        detections: List[ProtocolDetection]
+    ) -> None:
+        """Record freshly scanned detections for a file."""
+        self._seen[file_path] = {
+            'stamp': list(stamp),
+            'detections': [_detection_dict(d) for d in detections]
+        }
+    
+    def get_result(self, key: str) -> Optional[AnalysisResult]:
+        """Return the cached analysis result stored under key, or None."""
+        if self._result is None or self._result.get('key') != key:
+            return None
+        try:
+            return _result_from_dict(self._result['data'])
+        except (KeyError, TypeError, ValueError):
+            self._result = None  # Malformed - analyze again and replace it
+            return None
+    
+    def put_result(self, key: str, result: AnalysisResult) -> None:
+        """Record an analysis result under key, replacing any other."""
+        self._result = {'key': key, 'data': _result_dict(result)}
+
+
+def _tree_key(
+    project_path: str,
+    requirement: str,
+    files: List[str],
+    stamps: Dict[str, Tuple[int, int]]
+) -> str:
+    """Hash a project's path, requirement and every file's stamp into a cache key."""
+    import hashlib
+    
+    digest = hashlib.sha1()
+    digest.update(f"{project_path}\0{requirement}\n".encode('utf-8', 'surrogateescape'))
+    for file_path in files:
+        line = f"{file_path}\0{stamps.get(file_path)}\n"
+        digest.update(line.encode('utf-8', 'surrogateescape'))
+    return digest.hexdigest()
+
+
+def _result_from_dict(data: Dict[str, Any]) -> AnalysisResult:
+    """Rebuild an AnalysisResult from the dict produced by _result_dict()."""
+    protocols = [
+        ProjectProtocol(**dict(
+            p,
+            detections=[ProtocolDetection(**d) for d in p['detections']]
+        ))
+        for p in data['detected_protocols']
+    ]
+    recommendations = [
+        ProtocolRecommendation(**r) for r in data['recommendations']
+    ]
+    return AnalysisResult(**dict(
+        data,
+        detected_protocols=protocols,
+        recommendations=recommendations
+    ))
+
 
 # ============================================================================
 # PROTOCOL DETECTOR
 # ============================================================================
 
+def _line_span(content: bytes, offset: int, before: int, after: int) -> bytes:
+    """
+    Slice the line containing ``offset`` plus up to ``before`` lines above it
+    and ``after`` lines below it out of ``content``.
+    
+    Only the newlines bordering the window are searched for, so no per-line
+    index of the file is needed.
+    """
+    start = offset
+    for _ in range(before + 1):
+        start = content.rfind(b'\n', 0, start)
+        if start < 0:
+            break
+    end = offset
+    for _ in range(after + 1):
+        end = content.find(b'\n', end)
+        if end < 0:
+            end = len(content)
+            break
+        end += 1
+    else:
+        end -= 1
+    return content[start + 1:end]
+
+
+# Files whose first SNIFF_BYTES contain a NUL byte (binary) or a line longer
+# than MAX_LINE_LENGTH (minified/generated) are skipped entirely
+SNIFF_BYTES = 8192
+MAX_LINE_LENGTH = 2000
+_LONG_LINE_RE = re.compile(rb'[^\r\n]{%d}' % (MAX_LINE_LENGTH + 1))
+
+# Files larger than this are skipped (0 = no limit), and a protocol stops
+# being searched in a file once it has this many detections there. The cap
+# bounds work on vendored/generated files, but everything counted from
+# detections (references, average confidence, complexity, recommendations)
+# sees the capped numbers
+MAX_FILE_BYTES = 2_000_000
+MAX_MATCHES_PER_PROTOCOL = 50
+
+
+def _scan_file_worker(
+    file_path: Union[str, Path],
+    max_file_bytes: int = MAX_FILE_BYTES,
+    max_matches: int = MAX_MATCHES_PER_PROTOCOL,
+    patterns: Optional[Dict[str, List[Tuple[str, float]]]] = None
+) -> List[ProtocolDetection]:
+    """
+    Scan a single file for protocol patterns and return its detections.
+    
+    Kept at module level with no shared state so it can run in a process pool.
+    Pool workers are passed the parent's ``patterns`` table, since a worker
+    started with spawn re-imports the module and would not see additions.
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if max_file_bytes and size > max_file_bytes:
+                return []
+            # Sniff the head first so binary blobs and minified bundles are
+            # rejected without reading the rest of the file
+            content = f.read(SNIFF_BYTES)
+            if b'\x00' in content or _LONG_LINE_RE.search(content):
+                return []
+            if len(content) == SNIFF_BYTES:
+                content += f.read()
+    except Exception:
+        return []
+    
+    # Interned so every detection (and summary file set) shares one object
+    return _scan_content(
+        content, sys.intern(str(file_path)), _compiled_patterns(patterns), max_matches
+    )
+
+
+def _scan_content(
+    content: bytes,
+    fp_str: str,
+    compiled: _CompiledPatterns,
+    max_matches: int = MAX_MATCHES_PER_PROTOCOL
+) -> List[ProtocolDetection]:
+    """
+    Return the detections in a file's raw bytes, keeping at most
+    ``max_matches`` per protocol (0 = no limit).
+    """
+    # Match text-mode universal newlines so line numbers and context agree
+    # for CRLF and bare-CR files
+    if content.find(b'\r') != -1:
+        content = content.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+
+    detections: List[ProtocolDetection] = []
+    contexts: Dict[int, str] = {}
+    
+    # Patterns and literal prefilters are both matched against this
+    # lowercased copy (bytes.lower() folds ASCII letters only, like
+    # re.IGNORECASE on bytes); context is still sliced from the original.
+    lowered = content.lower()
+
+    # Hoisted out of the match loop, which can run thousands of times per file.
+    # Lowering keeps every offset, so newlines are counted on the copy.
+    append = detections.append
+    count = lowered.count
+    limit = max_matches or sys.maxsize
+
+    for protocol, (literals, patterns) in compiled.items():
+        if literals and not any(
+            literal in lowered for literal in literals
+        ):
+            continue
+
+        # Vendored files can repeat one call thousands of times; past the
+        # cap the protocol's presence in the file is already established.
+        # Earlier patterns fill the cap first, so capped counts and average
+        # confidence differ from an uncapped scan.
+        found = 0
+        for regex, pattern, confidence, pattern_literals in patterns:
+            if found >= limit:
+                break
+            if pattern_literals and not any(
+                literal in lowered for literal in pattern_literals
+            ):
+                continue
+
+            # Line numbers are counted forward from the previous match, so
+            # each pattern walks the file once and no per-line work is done
+            i = 1
+            last_line = 0
+            position = 0
+            for match in regex.finditer(lowered):
+                offset = match.start()
+                i += count(b'\n', position, offset)
+                position = offset
+                if i == last_line:
+                    continue  # One detection per pattern per line
+                last_line = i
+
+                # Get context (2 lines before and after), decoding only
+                # this window rather than the whole file. Built once per
+                # line and shared by every detection on it.
+                context = contexts.get(i)
+                if context is None:
+                    context = _line_span(content, offset, 2, 2).decode(
+                        'utf-8', errors='ignore'
+                    )
+                    contexts[i] = context
+
+                append(ProtocolDetection(
+                    protocol, fp_str, i, pattern, confidence, context
+                ))
+                found += 1
+                if found >= limit:
+                    break
+
+    return detections
+
+
 class ProtocolDetector:
     """Detects protocols in project files."""
     
@@ -465,349 +1201,512 @@ class ProtocolDetector:
         '.pytest_cache', '.mypy_cache', 'target', 'vendor'
     }
     
-    def __init__(self):
-        """Initialize the detector."""
+    # Below this many files a process pool costs more than it saves
+    PARALLEL_MIN_FILES = 16
+    
+    def __init__(
+        self,
+        jobs: int = 1,
+        use_cache: bool = False,
+        max_file_bytes: int = MAX_FILE_BYTES,
+        max_matches: int = MAX_MATCHES_PER_PROTOCOL
+    ):
+        """
+        Initialize the detector.
+        
+        Args:
+            jobs: Number of worker processes for scanning files
+                  (1 = sequential, 0 = one per CPU)
+            use_cache: Reuse results for unchanged files across directory
+                       scans via a cache file in the project root
+            max_file_bytes: Skip files larger than this (0 = no limit)
+            max_matches: Keep at most this many detections per protocol
+                         per file (0 = no limit)
+        """
+        self.jobs = jobs
+        self.use_cache = use_cache
+        self.max_file_bytes = max_file_bytes
+        self.max_matches = max_matches
         self.detections: List[ProtocolDetection] = []
-        self.file_protocol_lines: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.file_protocol_lines: Counter = Counter()  # (file, protocol) -> matches
         
+    def reset(self) -> None:
+        """Forget the detections of any previous scan."""
+        self.detections = []
+        self.file_protocol_lines = Counter()
+    
+    def open_cache(self, project_path: Path) -> CacheStore:
+        """Load the cache file kept in a project directory."""
+        cache = CacheStore(
+            project_path / CacheStore.FILENAME,
+            {'max_file_bytes': self.max_file_bytes, 'max_matches': self.max_matches}
+        )
+        cache.load()
+        return cache
+    
     def scan_project(self, project_path: Path) -> List[ProtocolDetection]:
         """Scan a project directory for protocol patterns."""
-        self.detections = []
-        self.file_protocol_lines = defaultdict(lambda: defaultdict(int))
+        self.reset()
         
-        if not project_path.exists():
-            raise FileNotFoundError(f"Project path not found: {project_path}")
+        # One stat answers both "does it exist" and "is it a file"
+        try:
+            mode = project_path.stat().st_mode
+        except (FileNotFoundError, NotADirectoryError):
+            raise FileNotFoundError(f"Project path not found: {project_path}") from None
             
-        if project_path.is_file():
+        if stat.S_ISREG(mode):
             self._scan_file(project_path)
         else:
-            self._scan_directory(project_path)
+            files: List[str] = []
+            self._collect_files(project_path, files)
+            if self.use_cache:
+                cache = self.open_cache(project_path)
+                self._scan_files(files, cache, self._stamp_files(files))
+                cache.save()
+            else:
+                self._scan_files(files)
             
         return self.detections
     
-    def _scan_directory(self, directory: Path) -> None:
-        """Recursively scan a directory."""
+    def _collect_files(self, directory: Path, files: List[str]) -> None:
+        """Collect the paths of scannable files under a directory, depth first."""
+        # DirEntry answers is_dir/is_file from the directory listing itself,
+        # so unlike Path.iterdir this costs no extra stat per entry. Open
+        # listings are kept on an explicit stack rather than recursing, so
+        # deeply nested trees cannot hit the recursion limit; descending
+        # as soon as a directory is seen keeps the recursive walk order.
+        skip_dirs = self.SKIP_DIRS
+        extensions = self.SCAN_EXTENSIONS
+        stack = []
+        try:
+            stack.append(os.scandir(directory))
+        except PermissionError:
+            return  # Skip directories we can't access
+        
         try:
-            for entry in directory.iterdir():
-                if entry.name in self.SKIP_DIRS:
+            while stack:
+                try:
+                    entry = next(stack[-1], None)
+                except PermissionError:
+                    entry = None
+                if entry is None:
+                    stack.pop().close()
                     continue
-                if entry.name.startswith('.'):
+                    
+                name = entry.name
+                if name in skip_dirs:
+                    continue
+                if name.startswith('.'):
                     continue
                     
-                if entry.is_dir():
-                    self._scan_directory(entry)
-                elif entry.is_file() and entry.suffix in self.SCAN_EXTENSIONS:
-                    self._scan_file(entry)
-        except PermissionError:
-            pass  # Skip directories we can't access
+                # Symlinked directories are not followed (avoids link cycles)
+                if entry.is_dir(follow_symlinks=False):
+                    try:
+                        stack.append(os.scandir(entry.path))
+                    except PermissionError:
+                        pass
+                elif (os.path.splitext(name)[1] in extensions
+                      and entry.is_file()):
+                    files.append(entry.path)
+        finally:
+            for entries in stack:
+                entries.close()
+    
+    @staticmethod
+    def _stamp_files(files: List[str]) -> Dict[str, Tuple[int, int]]:
+        """Map each file that can be stat'ed to its ``(mtime_ns, size)``."""
+        stamps: Dict[str, Tuple[int, int]] = {}
+        for file_path in files:
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                continue
+            stamps[file_path] = (st.st_mtime_ns, st.st_size)
+        return stamps
+    
+    def _scan_files(
+        self,
+        files: List[str],
+        cache: Optional[CacheStore] = None,
+        stamps: Optional[Dict[str, Tuple[int, int]]] = None
+    ) -> None:
+        """Scan collected files, skipping any the cache already covers."""
+        results: Dict[str, List[ProtocolDetection]] = {}
+        stamps = stamps or {}
+        pending = files
+        
+        if cache is not None:
+            pending = []
+            for file_path in files:
+                stamp = stamps.get(file_path)
+                cached = None if stamp is None else cache.get(file_path, stamp)
+                if cached is None:
+                    pending.append(file_path)
+                else:
+                    results[file_path] = cached
+        
+        for file_path, detections in zip(pending, self._map_scan(pending)):
+            results[file_path] = detections
+            if cache is not None and file_path in stamps:
+                cache.put(file_path, stamps[file_path], detections)
+        
+        # Record in walk order so cached and fresh runs report identically
+        for file_path in files:
+            self._record(results[file_path])
+    
+    def _map_scan(self, files: List[str]) -> Iterator[List[ProtocolDetection]]:
+        """Yield detections per file, fanning out to a process pool when worthwhile."""
+        jobs = self.jobs or os.cpu_count() or 1
+        if jobs <= 1 or len(files) < self.PARALLEL_MIN_FILES:
+            for file_path in files:
+                yield _scan_file_worker(file_path, self.max_file_bytes, self.max_matches)
+            return
+        
+        from concurrent.futures import ProcessPoolExecutor
+        
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            yield from executor.map(
+                _scan_file_worker,
+                files,
+                [self.max_file_bytes] * len(files),
+                [self.max_matches] * len(files),
+                [DETECTION_PATTERNS] * len(files),
+                chunksize=32
+            )
     
     def _scan_file(self, file_path: Path) -> None:
         """Scan a single file for protocol patterns."""
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                lines = content.split('\n')
-        except Exception:
-            return
-            
-        for protocol, patterns in DETECTION_PATTERNS.items():
-            for pattern, confidence in patterns:
-                for i, line in enumerate(lines, 1):
-                    if re.search(pattern, line, re.IGNORECASE):
-                        # Get context (2 lines before and after)
-                        start = max(0, i - 3)
-                        end = min(len(lines), i + 2)
-                        context = '\n'.join(lines[start:end])
-                        
-                        detection = ProtocolDetection(
-                            protocol=protocol,
-                            file_path=str(file_path),
-                            line_number=i,
-                            pattern_matched=pattern,
-                            confidence=confidence,
-                            context=context
-                        )
-                        self.detections.append(detection)
-                        self.file_protocol_lines[str(file_path)][protocol] += 1
+        self._record(
+            _scan_file_worker(file_path, self.max_file_bytes, self.max_matches)
+        )
+    
+    def _record(self, detections: List[ProtocolDetection]) -> None:
+        """Add one file's detections to the running totals."""
+        self.detections.extend(detections)
+        self.file_protocol_lines.update(
+            (detection.file_path, detection.protocol) for detection in detections
+        )
     
     def get_protocol_summary(self) -> Dict[str, Dict[str, Any]]:
         """Get summary of detected protocols."""
-        summary = defaultdict(lambda: {
-            'detections': [],
-            'files': set(),
-            'total_matches': 0,
-            'max_confidence': 0.0,
-            'avg_confidence': 0.0,
-            'is_client': False,
-            'is_server': False
-        })
-        
+        # Group once, then aggregate each protocol's detections column by
+        # column rather than updating a nested dict per detection
+        grouped: Dict[str, List[ProtocolDetection]] = {}
         for detection in self.detections:
-            proto = detection.protocol
-            summary[proto]['detections'].append(detection)
-            summary[proto]['files'].add(detection.file_path)
-            summary[proto]['total_matches'] += 1
-            summary[proto]['max_confidence'] = max(
-                summary[proto]['max_confidence'],
-                detection.confidence
-            )
-            
-            # Check if client or server
-            for pattern in CLIENT_PATTERNS:
-                if re.search(pattern, detection.context, re.IGNORECASE):
-                    summary[proto]['is_client'] = True
-            for pattern in SERVER_PATTERNS:
-                if re.search(pattern, detection.context, re.IGNORECASE):
-                    summary[proto]['is_server'] = True
-        
-        # Calculate averages
-        for proto in summary:
-            if summary[proto]['total_matches'] > 0:
-                total_conf = sum(d.confidence for d in summary[proto]['detections'])
-                summary[proto]['avg_confidence'] = total_conf / summary[proto]['total_matches']
-            summary[proto]['files'] = list(summary[proto]['files'])
+            group = grouped.get(detection.protocol)
+            if group is None:
+                grouped[detection.protocol] = group = []
+            group.append(detection)
+        
+        summary = {}
+        for proto, detections in grouped.items():
+            confidences = [d.confidence for d in detections]
+            # Detections on one line share a context, and clones of a file
+            # repeat it; each distinct context is searched at most once
+            contexts = {d.context for d in detections}
+            summary[proto] = {
+                'detections': detections,
+                'files': list({d.file_path: None for d in detections}),
+                'total_matches': len(detections),
+                'max_confidence': max(0.0, max(confidences)),
+                'avg_confidence': sum(confidences) / len(detections),
+                'is_client': any(map(_CLIENT_RE.search, contexts)),
+                'is_server': any(map(_SERVER_RE.search, contexts))
+            }
         
-        return dict(summary)
+        return summary
 
 
 # ============================================================================
 # COMPLEXITY CALCULATOR
 # ============================================================================
 
-class ComplexityCalculator:
-    """Calculate protocol complexity scores."""
+# Migration effort in hours (min, max) before adjusting for file count
+MIGRATION_HOURS = {
+    "LOW": (0.5, 2),      # 0.5-2 hours
+    "MEDIUM": (2, 8),     # 2-8 hours
+    "HIGH": (8, 40)       # 8-40 hours (1-5 days)
+}
+
+
+def calculate_complexity(
+    protocol: str,
+    detections: List[ProtocolDetection],
+    file_count: int,
+    line_count: int
+) -> float:
+    """
+    Calculate complexity score for a protocol.
     
-    def __init__(self):
-        """Initialize the calculator."""
-        pass
+    Score = base_complexity * scale_factor * confidence_factor * spread_factor
     
-    def calculate_complexity(
-        self,
-        protocol: str,
-        detections: List[ProtocolDetection],
-        file_count: int,
-        line_count: int
-    ) -> float:
-        """
-        Calculate complexity score for a protocol.
-        
-        Score = base_complexity * scale_factor * confidence_factor * spread_factor
-        
-        Returns score from 0-100.
-        """
-        if protocol not in PROTOCOLS_DB:
-            return 50.0  # Unknown protocol gets medium score
-            
-        info = PROTOCOLS_DB[protocol]
-        base = info.complexity_base  # 1-10
-        
-        # Scale factor based on usage (1.0 to 2.0)
-        scale = 1.0 + min(1.0, line_count / 500)
-        
-        # Confidence factor (0.5 to 1.0)
-        if detections:
-            avg_conf = sum(d.confidence for d in detections) / len(detections)
-            confidence_factor = 0.5 + (avg_conf * 0.5)
-        else:
-            confidence_factor = 0.5
-        
-        # Spread factor - more files = higher complexity (1.0 to 1.5)
-        spread = 1.0 + min(0.5, file_count / 20)
-        
-        # Calculate final score (normalize to 0-100)
-        score = base * scale * confidence_factor * spread * 10
-        
-        return min(100.0, max(0.0, score))
+    Returns score from 0-100.
+    """
+    if detections:
+        avg_conf = sum(d.confidence for d in detections) / len(detections)
+    else:
+        avg_conf = None
+    return _complexity_score(protocol, file_count, line_count, avg_conf)
+
+
+@lru_cache(maxsize=512)
+def _complexity_score(
+    protocol: str,
+    file_count: int,
+    line_count: int,
+    avg_conf: Optional[float]
+) -> float:
+    """Score from the hashable inputs of calculate_complexity (memoized)."""
+    if protocol not in PROTOCOLS_DB:
+        return 50.0  # Unknown protocol gets medium score
+        
+    info = PROTOCOLS_DB[protocol]
+    base = info.complexity_base  # 1-10
     
-    def calculate_migration_complexity(
-        self,
-        from_protocol: str,
-        to_protocol: str,
-        current_usage: int
-    ) -> str:
-        """
-        Estimate migration complexity between protocols.
-        
-        Returns: LOW, MEDIUM, or HIGH
-        """
-        # Same category = easier migration
-        if from_protocol in PROTOCOLS_DB and to_protocol in PROTOCOLS_DB:
-            from_cat = PROTOCOLS_DB[from_protocol].category
-            to_cat = PROTOCOLS_DB[to_protocol].category
-            
-            if from_cat == to_cat:
-                if current_usage < 10:
-                    return "LOW"
-                elif current_usage < 50:
-                    return "MEDIUM"
-                else:
-                    return "HIGH"
-            else:
-                # Different category = harder
-                if current_usage < 5:
-                    return "MEDIUM"
-                else:
-                    return "HIGH"
-        
-        return "MEDIUM"
+    # Scale factor based on usage (1.0 to 2.0)
+    scale = 1.0 + min(1.0, line_count / 500)
     
-    def estimate_migration_time(
-        self,
-        complexity: str,
-        file_count: int
-    ) -> str:
-        """Estimate time to migrate based on complexity."""
-        base_times = {
-            "LOW": (0.5, 2),      # 0.5-2 hours
-            "MEDIUM": (2, 8),     # 2-8 hours
-            "HIGH": (8, 40)       # 8-40 hours (1-5 days)
-        }
-        
-        min_h, max_h = base_times.get(complexity, (2, 8))
-        
-        # Adjust for file count
-        multiplier = 1 + (file_count / 10)
-        min_h *= multiplier
-        max_h *= multiplier
-        
-        if max_h < 1:
-            return "< 1 hour"
-        elif max_h < 4:
-            return f"{min_h:.0f}-{max_h:.0f} hours"
-        elif max_h < 16:
-            return f"{min_h/8:.1f}-{max_h/8:.1f} days"
+    # Confidence factor (0.5 to 1.0)
+    if avg_conf is not None:
+        confidence_factor = 0.5 + (avg_conf * 0.5)
+    else:
+        confidence_factor = 0.5
+    
+    # Spread factor - more files = higher complexity (1.0 to 1.5)
+    spread = 1.0 + min(0.5, file_count / 20)
+    
+    # Calculate final score (normalize to 0-100)
+    score = base * scale * confidence_factor * spread * 10
+    
+    return min(100.0, max(0.0, score))
+
+
+def calculate_migration_complexity(
+    from_protocol: str,
+    to_protocol: str,
+    current_usage: int
+) -> str:
+    """
+    Estimate migration complexity between protocols.
+    
+    Returns: LOW, MEDIUM, or HIGH
+    """
+    # Same category = easier migration
+    if from_protocol in PROTOCOLS_DB and to_protocol in PROTOCOLS_DB:
+        from_cat = PROTOCOLS_DB[from_protocol].category
+        to_cat = PROTOCOLS_DB[to_protocol].category
+        
+        if from_cat == to_cat:
+            if current_usage < 10:
+                return "LOW"
+            elif current_usage < 50:
+                return "MEDIUM"
+            else:
+                return "HIGH"
         else:
-            return f"{min_h/40:.1f}-{max_h/40:.1f} weeks"
+            # Different category = harder
+            if current_usage < 5:
+                return "MEDIUM"
+            else:
+                return "HIGH"
+    
+    return "MEDIUM"
+
+
+@lru_cache(maxsize=512)
+def estimate_migration_time(
+    complexity: str,
+    file_count: int
+) -> str:
+    """Estimate time to migrate based on complexity (memoized)."""
+    min_h, max_h = MIGRATION_HOURS.get(complexity, (2, 8))
+    
+    # Adjust for file count
+    multiplier = 1 + (file_count / 10)
+    min_h *= multiplier
+    max_h *= multiplier
+    
+    if max_h < 1:
+        return "< 1 hour"
+    elif max_h < 4:
+        return f"{min_h:.0f}-{max_h:.0f} hours"
+    elif max_h < 16:
+        return f"{min_h/8:.1f}-{max_h/8:.1f} days"
+    else:
+        return f"{min_h/40:.1f}-{max_h/40:.1f} weeks"
+
+
+class ComplexityCalculator:
+    """Calculate protocol complexity scores (wraps the module-level functions)."""
+    
+    MIGRATION_HOURS = MIGRATION_HOURS
+    
+    calculate_complexity = staticmethod(calculate_complexity)
+    calculate_migration_complexity = staticmethod(calculate_migration_complexity)
+    estimate_migration_time = staticmethod(estimate_migration_time)
 
 
 # ============================================================================
 # RECOMMENDATION ENGINE
 # ============================================================================
 
-class RecommendationEngine:
-    """Generate protocol recommendations."""
+def generate_recommendations(
+    detected_protocols: Dict[str, Dict],
+    requirement: str = "realtime",
+    top_k: Optional[int] = None
+) -> List[ProtocolRecommendation]:
+    """
+    Generate protocol recommendations based on detected usage.
     
-    def __init__(self):
-        """Initialize the engine."""
-        self.complexity_calc = ComplexityCalculator()
-        
-    def generate_recommendations(
-        self,
-        detected_protocols: Dict[str, Dict],
-        requirement: str = "realtime"
-    ) -> List[ProtocolRecommendation]:
-        """
-        Generate protocol recommendations based on detected usage.
+    Args:
+        detected_protocols: Summary from ProtocolDetector
+        requirement: realtime, request-response, streaming, or rpc
+        top_k: Return only the best this many (None = all)
         
-        Args:
-            detected_protocols: Summary from ProtocolDetector
-            requirement: realtime, request-response, streaming, or rpc
-            
-        Returns:
-            List of recommendations sorted by score (best first)
-        """
-        recommendations = []
-        
-        # Get existing protocols
-        existing = set(detected_protocols.keys())
+    Returns:
+        List of recommendations sorted by score (best first)
+    """
+    recommendations = []
+    
+    # Get existing protocols
+    existing = set(detected_protocols.keys())
+    
+    # The most-used existing protocol is the migration source for every
+    # candidate, so find it once rather than per candidate
+    if existing:
+        main_existing = max(
+            existing,
+            key=lambda p: detected_protocols.get(p, {}).get('total_matches', 0)
+        )
+        main_data = detected_protocols.get(main_existing, {})
+        main_matches = main_data.get('total_matches', 0)
+        main_files = len(main_data.get('files', []))
+    
+    # Score each potential protocol
+    for protocol, info in PROTOCOLS_DB.items():
+        score, rationale = _calculate_recommendation_score(
+            protocol, info, existing, detected_protocols, requirement
+        )
         
-        # Score each potential protocol
-        for protocol, info in PROTOCOLS_DB.items():
-            score, rationale = self._calculate_recommendation_score(
-                protocol, info, existing, detected_protocols, requirement
-            )
-            
-            # Calculate migration complexity if switching
-            if existing and protocol not in existing:
-                main_existing = max(
-                    existing,
-                    key=lambda p: detected_protocols.get(p, {}).get('total_matches', 0)
-                )
-                migration = self.complexity_calc.calculate_migration_complexity(
-                    main_existing,
-                    protocol,
-                    detected_protocols.get(main_existing, {}).get('total_matches', 0)
-                )
-                file_count = len(detected_protocols.get(main_existing, {}).get('files', []))
-                time_est = self.complexity_calc.estimate_migration_time(migration, file_count)
-            else:
-                migration = "LOW" if protocol in existing else "MEDIUM"
-                time_est = "< 1 hour" if protocol in existing else "2-4 hours"
-            
-            rec = ProtocolRecommendation(
-                protocol=info.name,
-                score=score,
-                rationale=rationale,
-                pros=info.pros.copy(),
-                cons=info.cons.copy(),
-                migration_complexity=migration,
-                estimated_time=time_est
+        # Calculate migration complexity if switching
+        if existing and protocol not in existing:
+            migration = calculate_migration_complexity(
+                main_existing,
+                protocol,
+                main_matches
             )
-            recommendations.append(rec)
-        
-        # Sort by score (highest first)
-        recommendations.sort(key=lambda r: r.score, reverse=True)
-        
-        return recommendations
+            time_est = estimate_migration_time(migration, main_files)
+        else:
+            migration = "LOW" if protocol in existing else "MEDIUM"
+            time_est = "< 1 hour" if protocol in existing else "2-4 hours"
+        
+        rec = ProtocolRecommendation(
+            protocol=info.name,
+            score=score,
+            rationale=rationale,
+            pros=list(info.pros),
+            cons=list(info.cons),
+            migration_complexity=migration,
+            estimated_time=time_est
+        )
+        recommendations.append(rec)
     
-    def _calculate_recommendation_score(
-        self,
-        protocol: str,
-        info: ProtocolInfo,
-        existing: Set[str],
-        detected: Dict,
-        requirement: str
-    ) -> Tuple[float, List[str]]:
-        """Calculate recommendation score and rationale."""
-        score = 50.0  # Base score
-        rationale = []
-        
-        # Bonus for matching requirement category
-        if info.category == requirement:
-            score += 20
-            rationale.append(f"Matches requirement: {requirement}")
-        elif requirement == "realtime" and info.category in ["realtime", "streaming"]:
-            score += 15
-            rationale.append(f"Good for real-time communication")
-        
-        # Bonus for already being used (consistency)
-        if protocol in existing:
-            usage = detected.get(protocol, {}).get('total_matches', 0)
-            score += min(25, usage * 2)  # Up to 25 points
-            rationale.append(f"Already in use ({usage} references found)")
-        
-        # Penalty for complexity
-        complexity_penalty = (info.complexity_base - 1) * 3  # 0-27 penalty
-        score -= complexity_penalty
-        if complexity_penalty > 15:
-            rationale.append(f"Higher complexity (base: {info.complexity_base}/10)")
-        
-        # Bonus for same category as existing
-        for existing_proto in existing:
-            if existing_proto in PROTOCOLS_DB:
-                if PROTOCOLS_DB[existing_proto].category == info.category:
-                    score += 10
-                    rationale.append(f"Same category as existing {existing_proto}")
-                    break
-        
-        # Bonus for simplicity (fewer dependencies typically = simpler)
-        if info.complexity_base <= 3:
-            score += 10
-            rationale.append("Simple, low-overhead protocol")
-        
-        # Ensure score is in valid range
-        score = max(0, min(100, score))
-        
-        if not rationale:
-            rationale.append("Standard option")
-        
-        return score, rationale
+    # Sort by score (highest first); both keep equal scores in database order
+    if top_k is not None:
+        return heapq.nlargest(top_k, recommendations, key=attrgetter('score'))
+    recommendations.sort(key=attrgetter('score'), reverse=True)
+    
+    return recommendations
+
+
+def _calculate_recommendation_score(
+    protocol: str,
+    info: ProtocolInfo,
+    existing: Set[str],
+    detected: Dict,
+    requirement: str
+) -> Tuple[float, List[str]]:
+    """Calculate recommendation score and rationale."""
+    score = 50.0  # Base score
+    rationale = []
+    
+    # Bonus for matching requirement category
+    if info.category == requirement:
+        score += 20
+        rationale.append(f"Matches requirement: {requirement}")
+    elif requirement == "realtime" and info.category in ["realtime", "streaming"]:
+        score += 15
+        rationale.append(f"Good for real-time communication")
+    
+    # Bonus for already being used (consistency)
+    if protocol in existing:
+        usage = detected.get(protocol, {}).get('total_matches', 0)
+        score += min(25, usage * 2)  # Up to 25 points
+        rationale.append(f"Already in use ({usage} references found)")
+    
+    # Penalty for complexity
+    complexity_penalty = (info.complexity_base - 1) * 3  # 0-27 penalty
+    score -= complexity_penalty
+    if complexity_penalty > 15:
+        rationale.append(f"Higher complexity (base: {info.complexity_base}/10)")
+    
+    # Bonus for same category as existing
+    for existing_proto in existing:
+        if existing_proto in PROTOCOLS_DB:
+            if PROTOCOLS_DB[existing_proto].category == info.category:
+                score += 10
+                rationale.append(f"Same category as existing {existing_proto}")
+                break
+    
+    # Bonus for simplicity (fewer dependencies typically = simpler)
+    if info.complexity_base <= 3:
+        score += 10
+        rationale.append("Simple, low-overhead protocol")
+    
+    # Ensure score is in valid range
+    score = max(0, min(100, score))
+    
+    if not rationale:
+        rationale.append("Standard option")
+    
+    return score, rationale
+
+
+class RecommendationEngine:
+    """Generate protocol recommendations (wraps the module-level functions)."""
+    
+    generate_recommendations = staticmethod(generate_recommendations)
+    
+    def __init__(self):
+        """Initialize the engine."""
+        # Kept for callers that used it; the scoring functions are stateless
+        self.complexity_calc = ComplexityCalculator()
 
 
 # ============================================================================
 # MAIN ANALYZER
 # ============================================================================
 
+# Architecture by (has_server << 1 | has_client)
+_ARCHITECTURE_TYPES = ("unknown", "frontend", "backend", "full-stack")
+
+# Warning rules used by ProtocolAnalyzer._generate_warnings
+_REALTIME_CATEGORY = "realtime"
+_HIGH_COMPLEXITY_THRESHOLD = 50
+_SOCKETIO_VERSION_MSG = (
+    "Socket.IO detected: Ensure client/server versions match "
+    "(v4 client requires v4 server)"
+)
+_MULTI_REALTIME_MSG = (
+    "Multiple real-time protocols detected: {}. "
+    "Consider consolidating to reduce complexity."
+).format
+_HIGH_COMPLEXITY_MSG = (
+    "High complexity protocols: {}. "
+    "Review if simpler alternatives exist."
+).format
+
+
 class ProtocolAnalyzer:
     """
     Main protocol analyzer class.
@@ -821,22 +1720,42 @@ class ProtocolAnalyzer:
         >>> print(result.summary)
     """
     
-    def __init__(self, verbose: bool = False):
+    def __init__(
+        self,
+        verbose: bool = False,
+        jobs: int = 1,
+        use_cache: bool = False,
+        max_file_bytes: int = MAX_FILE_BYTES,
+        max_matches: int = MAX_MATCHES_PER_PROTOCOL
+    ):
         """
         Initialize the analyzer.
         
         Args:
             verbose: Enable verbose output
+            jobs: Worker processes for file scanning (1 = sequential, 0 = one per CPU)
+            use_cache: Reuse per-file scan results for unchanged files, and
+                       the whole result when no file has changed
+            max_file_bytes: Skip files larger than this (0 = no limit)
+            max_matches: Count at most this many references per protocol per
+                         file (0 = no limit); scores use the capped counts
         """
         self.verbose = verbose
-        self.detector = ProtocolDetector()
+        # Public since 1.0; both are now thin wrappers over module functions
         self.complexity_calc = ComplexityCalculator()
         self.recommender = RecommendationEngine()
+        self.detector = ProtocolDetector(
+            jobs=jobs,
+            use_cache=use_cache,
+            max_file_bytes=max_file_bytes,
+            max_matches=max_matches
+        )
         
     def analyze(
         self,
         project_path: str,
-        requirement: str = "auto"
+        requirement: str = "auto",
+        refresh: bool = False
     ) -> AnalysisResult:
         """
         Analyze a project for protocol usage.
@@ -845,33 +1764,61 @@ class ProtocolAnalyzer:
             project_path: Path to project directory
             requirement: Type of communication needed (realtime, request-response,
                         streaming, rpc, or auto for auto-detect)
+            refresh: Ignore a cached result for an unchanged project (caching
+                     must be enabled for one to exist)
                         
         Returns:
             AnalysisResult with full analysis
         """
-        path = Path(project_path)
-        
-        if not path.exists():
-            raise FileNotFoundError(f"Project not found: {project_path}")
+        from datetime import datetime
         
-        # Detect protocols
-        detections = self.detector.scan_project(path)
+        path = Path(project_path)
+        detector = self.detector
+        cache = None
+        
+        if detector.use_cache and path.is_dir():
+            # Stat the tree up front: if no file changed since the cached
+            # result was built, return it without scanning anything
+            files: List[str] = []
+            detector._collect_files(path, files)
+            stamps = detector._stamp_files(files)
+            result_key = _tree_key(str(path.absolute()), requirement, files, stamps)
+            cache = detector.open_cache(path)
+            detector.reset()
+            cached = None if refresh else cache.get_result(result_key)
+            if cached is not None:
+                return cached
+            detector._scan_files(files, cache, stamps)
+        else:
+            # Detect protocols (the detector does the existence check)
+            try:
+                detector.scan_project(path)
+            except FileNotFoundError:
+                raise FileNotFoundError(f"Project not found: {project_path}") from None
         summary = self.detector.get_protocol_summary()
         
-        # Build ProjectProtocol objects
+        # Build ProjectProtocol objects, looking each one up in the database
+        # once for all the helpers below
         detected_protocols = []
+        info_map: Dict[str, Optional[ProtocolInfo]] = {}
+        total_complexity = 0.0
         for proto, data in summary.items():
+            # Names decoded from the cache or a worker process are copies
+            proto = sys.intern(proto)
+            info_map[proto] = PROTOCOLS_DB.get(proto)
+            score = calculate_complexity(
+                proto,
+                data['detections'],
+                len(data['files']),
+                data['total_matches']
+            )
+            total_complexity += score
             proj_proto = ProjectProtocol(
                 name=proto,
                 detections=data['detections'],
                 total_lines=data['total_matches'],
                 file_count=len(data['files']),
-                complexity_score=self.complexity_calc.calculate_complexity(
-                    proto,
-                    data['detections'],
-                    len(data['files']),
-                    data['total_matches']
-                ),
+                complexity_score=score,
                 is_client=data['is_client'],
                 is_server=data['is_server']
             )
@@ -882,19 +1829,17 @@ class ProtocolAnalyzer:
         
         # Auto-detect requirement if needed
         if requirement == "auto":
-            requirement = self._auto_detect_requirement(detected_protocols)
+            requirement = self._auto_detect_requirement(detected_protocols, info_map)
         
         # Generate recommendations
-        recommendations = self.recommender.generate_recommendations(
+        recommendations = generate_recommendations(
             summary,
-            requirement
+            requirement,
+            top_k=5
         )
         
-        # Calculate total complexity
-        total_complexity = sum(p.complexity_score for p in detected_protocols)
-        
         # Generate warnings
-        warnings = self._generate_warnings(detected_protocols, summary)
+        warnings = self._generate_warnings(detected_protocols, summary, info_map)
         
         # Generate summary
         summary_text = self._generate_summary(
@@ -903,86 +1848,87 @@ class ProtocolAnalyzer:
             architecture
         )
         
-        return AnalysisResult(
+        result = AnalysisResult(
             project_path=str(path.absolute()),
             timestamp=datetime.now().isoformat(),
             detected_protocols=detected_protocols,
             architecture_type=architecture,
             complexity_total=total_complexity,
-            recommendations=recommendations[:5],  # Top 5
+            recommendations=recommendations,
             summary=summary_text,
             warnings=warnings
         )
+        
+        if cache is not None:
+            cache.put_result(result_key, result)
+            cache.save()
+        return result
     
     def _determine_architecture(
         self,
         protocols: List[ProjectProtocol]
     ) -> str:
         """Determine the overall architecture type."""
-        has_client = any(p.is_client for p in protocols)
-        has_server = any(p.is_server for p in protocols)
-        
-        if has_client and has_server:
-            return "full-stack"
-        elif has_server:
-            return "backend"
-        elif has_client:
-            return "frontend"
-        else:
-            return "unknown"
+        # Bit 0 = any client, bit 1 = any server; stop once both are set
+        flags = 0
+        for p in protocols:
+            if p.is_client:
+                flags |= 1
+            if p.is_server:
+                flags |= 2
+            if flags == 3:
+                break
+        
+        return _ARCHITECTURE_TYPES[flags]
     
     def _auto_detect_requirement(
         self,
-        protocols: List[ProjectProtocol]
+        protocols: List[ProjectProtocol],
+        info_map: Dict[str, Optional[ProtocolInfo]]
     ) -> str:
         """Auto-detect the communication requirement."""
-        categories = defaultdict(int)
+        categories: Dict[str, int] = {}
         
         for proto in protocols:
-            if proto.name in PROTOCOLS_DB:
-                cat = PROTOCOLS_DB[proto.name].category
-                categories[cat] += proto.total_lines
+            info = info_map[proto.name]
+            if info is not None:
+                cat = info.category
+                categories[cat] = categories.get(cat, 0) + proto.total_lines
         
         if categories:
-            return max(categories, key=categories.get)
+            return max(categories.items(), key=itemgetter(1))[0]
         return "request-response"  # Default
     
     def _generate_warnings(
         self,
         protocols: List[ProjectProtocol],
-        summary: Dict
+        summary: Dict,
+        info_map: Dict[str, Optional[ProtocolInfo]]
     ) -> List[str]:
         """Generate warnings based on analysis."""
         warnings = []
         
         # Check for Socket.IO version issues
         if "socket.io" in summary:
-            warnings.append(
-                "Socket.IO detected: Ensure client/server versions match "
-                "(v4 client requires v4 server)"
-            )
+            warnings.append(_SOCKETIO_VERSION_MSG)
+        
+        # Collect real-time and high-complexity protocols in one pass
+        realtime_names = []
+        high_complexity_names = []
+        for p in protocols:
+            info = info_map[p.name]
+            if info is not None and info.category == _REALTIME_CATEGORY:
+                realtime_names.append(p.name)
+            if p.complexity_score > _HIGH_COMPLEXITY_THRESHOLD:
+                high_complexity_names.append(p.name)
         
         # Check for multiple real-time protocols
-        realtime_protos = [
-            p for p in protocols
-            if p.name in PROTOCOLS_DB and
-            PROTOCOLS_DB[p.name].category == "realtime"
-        ]
-        if len(realtime_protos) > 1:
-            names = [p.name for p in realtime_protos]
-            warnings.append(
-                f"Multiple real-time protocols detected: {', '.join(names)}. "
-                "Consider consolidating to reduce complexity."
-            )
+        if len(realtime_names) > 1:
+            warnings.append(_MULTI_REALTIME_MSG(', '.join(realtime_names)))
         
         # Check for high complexity
-        high_complexity = [p for p in protocols if p.complexity_score > 50]
-        if high_complexity:
-            names = [p.name for p in high_complexity]
-            warnings.append(
-                f"High complexity protocols: {', '.join(names)}. "
-                "Review if simpler alternatives exist."
-            )
+        if high_complexity_names:
+            warnings.append(_HIGH_COMPLEXITY_MSG(', '.join(high_complexity_names)))
         
         return warnings
     
@@ -1028,28 +1974,24 @@ class ProtocolAnalyzer:
         comparison = {}
         
         for proto in protocols:
-            proto_lower = proto.lower().replace(' ', '_').replace('-', '_')
+            proto_lower = _normalize_protocol_name(proto)
+            key = _PROTOCOL_ALIASES.get(proto_lower)
             
-            # Try to find matching protocol
-            if proto_lower in PROTOCOLS_DB:
-                info = PROTOCOLS_DB[proto_lower]
-            elif proto_lower.replace('_', '.') in PROTOCOLS_DB:
-                info = PROTOCOLS_DB[proto_lower.replace('_', '.')]
-            else:
+            if key is None:
                 # Try partial match
                 matches = [k for k in PROTOCOLS_DB if proto_lower in k or k in proto_lower]
-                if matches:
-                    info = PROTOCOLS_DB[matches[0]]
-                else:
+                if not matches:
                     comparison[proto] = {"error": "Protocol not found in database"}
                     continue
+                key = matches[0]
+            info = PROTOCOLS_DB[key]
             
             comparison[info.name] = {
                 "category": info.category,
                 "complexity": info.complexity_base,
-                "pros": info.pros,
-                "cons": info.cons,
-                "use_cases": info.typical_use_cases,
+                "pros": list(info.pros),
+                "cons": list(info.cons),
+                "use_cases": list(info.typical_use_cases),
                 "compatibility": info.compatibility_notes
             }
         
@@ -1070,18 +2012,12 @@ class ProtocolAnalyzer:
         Returns:
             Migration guide with steps and considerations
         """
-        from_key = from_protocol.lower().replace(' ', '_').replace('-', '_')
-        to_key = to_protocol.lower().replace(' ', '_').replace('-', '_')
+        from_key = _PROTOCOL_ALIASES.get(_normalize_protocol_name(from_protocol))
+        to_key = _PROTOCOL_ALIASES.get(_normalize_protocol_name(to_protocol))
         
-        # Normalize keys
-        if from_key.replace('_', '.') in PROTOCOLS_DB:
-            from_key = from_key.replace('_', '.')
-        if to_key.replace('_', '.') in PROTOCOLS_DB:
-            to_key = to_key.replace('_', '.')
-        
-        if from_key not in PROTOCOLS_DB:
+        if from_key is None:
             return {"error": f"Source protocol not found: {from_protocol}"}
-        if to_key not in PROTOCOLS_DB:
+        if to_key is None:
             return {"error": f"Target protocol not found: {to_protocol}"}
         
         from_info = PROTOCOLS_DB[from_key]
@@ -1116,7 +2052,7 @@ class ProtocolAnalyzer:
             "from": from_info.name,
             "to": to_info.name,
             "difficulty": difficulty,
-            "estimated_time": self.complexity_calc.estimate_migration_time(
+            "estimated_time": estimate_migration_time(
                 difficulty, 10
             ),
             "steps": steps,
@@ -1133,96 +2069,113 @@ class ProtocolAnalyzer:
             ]
         }
     
-    def to_json(self, result: AnalysisResult) -> str:
-        """Convert analysis result to JSON string."""
-        def serialize(obj):
-            if hasattr(obj, '__dict__'):
-                return {k: serialize(v) for k, v in obj.__dict__.items()}
-            elif isinstance(obj, list):
-                return [serialize(i) for i in obj]
-            elif isinstance(obj, dict):
-                return {k: serialize(v) for k, v in obj.items()}
-            else:
-                return obj
+    def to_json(self, result: AnalysisResult, indent: Optional[int] = 2) -> str:
+        """
+        Convert analysis result to JSON string.
         
-        return json.dumps(serialize(result), indent=2)
+        ``indent=None`` gives compact output with no whitespace between tokens.
+        """
+        # Any object outside the result's own fields is written out
+        # through its __dict__
+        import json
+        
+        return json.dumps(
+            _result_dict(result), indent=indent, default=vars,
+            separators=(',', ':') if indent is None else None
+        )
     
-    def to_markdown(self, result: AnalysisResult) -> str:
-        """Convert analysis result to Markdown report."""
-        lines = []
+    def write_json(
+        self,
+        result: AnalysisResult,
+        path: str,
+        indent: Optional[int] = 2
+    ) -> None:
+        """
+        Write analysis result as JSON to a file.
         
-        lines.append("# Protocol Analysis Report")
-        lines.append("")
-        lines.append(f"**Project:** {result.project_path}")
-        lines.append(f"**Analyzed:** {result.timestamp}")
-        lines.append(f"**Architecture:** {result.architecture_type}")
-        lines.append(f"**Total Complexity:** {result.complexity_total:.1f}")
-        lines.append("")
+        Compact output is built in one ``json.dumps`` call, which uses the C
+        encoder; indented output is streamed with ``json.dump`` instead.
+        """
+        import json
         
-        lines.append("## Summary")
-        lines.append("")
-        lines.append(result.summary)
-        lines.append("")
+        data = _result_dict(result)
+        with open(path, 'w', encoding='utf-8') as f:
+            if indent is None:
+                f.write(json.dumps(data, default=vars, separators=(',', ':')))
+            else:
+                json.dump(data, f, indent=indent, default=vars)
+    
+    def to_markdown(self, result: AnalysisResult) -> str:
+        """Convert analysis result to Markdown report."""
+        # Static text is kept in one literal per section; only the repeated
+        # rows are built per item
+        parts = [f"""# Protocol Analysis Report
+
+**Project:** {result.project_path}
+**Analyzed:** {result.timestamp}
+**Architecture:** {result.architecture_type}
+**Total Complexity:** {result.complexity_total:.1f}
+
+## Summary
+
+{result.summary}
+"""]
         
         if result.warnings:
-            lines.append("## Warnings")
-            lines.append("")
-            for warning in result.warnings:
-                lines.append(f"- [!] {warning}")
-            lines.append("")
+            parts.append("## Warnings\n")
+            parts.extend([f"- [!] {warning}" for warning in result.warnings])
+            parts.append("")
         
-        lines.append("## Detected Protocols")
-        lines.append("")
+        parts.append("## Detected Protocols\n")
         if result.detected_protocols:
-            lines.append("| Protocol | Files | References | Complexity | Client | Server |")
-            lines.append("|----------|-------|------------|------------|--------|--------|")
-            for proto in result.detected_protocols:
-                client = "[OK]" if proto.is_client else ""
-                server = "[OK]" if proto.is_server else ""
-                lines.append(
-                    f"| {proto.name} | {proto.file_count} | "
-                    f"{proto.total_lines} | {proto.complexity_score:.1f} | "
-                    f"{client} | {server} |"
-                )
-            lines.append("")
+            parts.append(
+                "| Protocol | Files | References | Complexity | Client | Server |\n"
+                "|----------|-------|------------|------------|--------|--------|"
+            )
+            parts.append('\n'.join([
+                "| " + " | ".join((
+                    proto.name,
+                    str(proto.file_count),
+                    str(proto.total_lines),
+                    f"{proto.complexity_score:.1f}",
+                    "[OK]" if proto.is_client else "",
+                    "[OK]" if proto.is_server else ""
+                )) + " |"
+                for proto in result.detected_protocols
+            ]))
+            parts.append("")
         else:
-            lines.append("No protocols detected.")
-            lines.append("")
+            parts.append("No protocols detected.\n")
         
-        lines.append("## Recommendations")
-        lines.append("")
+        parts.append("## Recommendations\n")
         for i, rec in enumerate(result.recommendations[:3], 1):
-            lines.append(f"### {i}. {rec.protocol} (Score: {rec.score:.0f}/100)")
-            lines.append("")
-            lines.append(f"**Migration Complexity:** {rec.migration_complexity}")
-            lines.append(f"**Estimated Time:** {rec.estimated_time}")
-            lines.append("")
-            lines.append("**Rationale:**")
-            for r in rec.rationale:
-                lines.append(f"- {r}")
-            lines.append("")
-            lines.append("**Pros:**")
-            for p in rec.pros[:3]:
-                lines.append(f"- {p}")
-            lines.append("")
-            lines.append("**Cons:**")
-            for c in rec.cons[:3]:
-                lines.append(f"- {c}")
-            lines.append("")
+            parts.append(f"""### {i}. {rec.protocol} (Score: {rec.score:.0f}/100)
+
+**Migration Complexity:** {rec.migration_complexity}
+**Estimated Time:** {rec.estimated_time}
+
+**Rationale:**""")
+            parts.extend([f"- {r}" for r in rec.rationale])
+            parts.append("\n**Pros:**")
+            parts.extend([f"- {p}" for p in rec.pros[:3]])
+            parts.append("\n**Cons:**")
+            parts.extend([f"- {c}" for c in rec.cons[:3]])
+            parts.append("")
         
-        lines.append("---")
-        lines.append("")
-        lines.append("*Generated by ProtocolAnalyzer v1.0 (Team Brain)*")
+        parts.append("---\n\n*Generated by ProtocolAnalyzer v1.0 (Team Brain)*")
         
-        return '\n'.join(lines)
+        return '\n'.join(parts)
 
 
 # ============================================================================
 # CLI INTERFACE
 # ============================================================================
 
-def create_parser() -> argparse.ArgumentParser:
+def create_parser() -> "argparse.ArgumentParser":
     """Create the argument parser."""
+    # Imported here so the plain `analyze <path>` fast path never loads it
+    import argparse
+    
     parser = argparse.ArgumentParser(
         prog='protocolanalyzer',
         description='Compare protocol options and recommend simplest solution',
@@ -1279,6 +2232,45 @@ For more information: https://github.com/DonkRonk17/ProtocolAnalyzer
         action='store_true',
         help='Enable verbose output'
     )
+    analyze_parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=1,
+        help='Worker processes for scanning files (default: 1, 0 = one per CPU)'
+    )
+    analyze_parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help=f'Rescan every file instead of reusing {CacheStore.FILENAME}'
+    )
+    analyze_parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help='Re-run the analysis even if the project is unchanged since the cached result'
+    )
+    analyze_parser.add_argument(
+        '--pretty',
+        action='store_true',
+        help='Indent JSON written to --output (default: compact; stdout is always indented)'
+    )
+    analyze_parser.add_argument(
+        '--max-file-size',
+        type=int,
+        default=MAX_FILE_BYTES,
+        metavar='BYTES',
+        help=f'Skip files larger than this (default: {MAX_FILE_BYTES}, 0 = no limit)'
+    )
+    analyze_parser.add_argument(
+        '--max-matches',
+        type=int,
+        default=MAX_MATCHES_PER_PROTOCOL,
+        metavar='N',
+        help=(
+            'Count at most N references per protocol in each file; reference '
+            'counts, confidence and scores use the capped counts '
+            f'(default: {MAX_MATCHES_PER_PROTOCOL}, 0 = no limit)'
+        )
+    )
     
     # Compare command
     compare_parser = subparsers.add_parser(
@@ -1335,6 +2327,7 @@ For more information: https://github.com/DonkRonk17/ProtocolAnalyzer
 def format_comparison(comparison: Dict, format_type: str) -> str:
     """Format comparison output."""
     if format_type == 'json':
+        import json
         return json.dumps(comparison, indent=2)
     elif format_type == 'markdown':
         lines = ["# Protocol Comparison", ""]
@@ -1373,6 +2366,7 @@ def format_comparison(comparison: Dict, format_type: str) -> str:
 def format_migration(guide: Dict, format_type: str) -> str:
     """Format migration guide output."""
     if format_type == 'json':
+        import json
         return json.dumps(guide, indent=2)
     elif format_type == 'markdown':
         if "error" in guide:
@@ -1408,28 +2402,71 @@ def format_migration(guide: Dict, format_type: str) -> str:
         return '\n'.join(lines)
 
 
+def _parse_fast(argv: List[str]) -> Optional[SimpleNamespace]:
+    """
+    Parse the common ``analyze <path>`` invocation without argparse.
+    
+    Returns the same attributes ``create_parser().parse_args`` would, or None
+    when any option is given so the full parser handles it.
+    """
+    if len(argv) != 2 or argv[0] != 'analyze' or argv[1].startswith('-'):
+        return None
+    return SimpleNamespace(
+        command='analyze',
+        project_path=argv[1],
+        requirement='auto',
+        output=None,
+        format='text',
+        verbose=False,
+        jobs=1,
+        no_cache=False,
+        refresh=False,
+        pretty=False,
+        max_file_size=MAX_FILE_BYTES,
+        max_matches=MAX_MATCHES_PER_PROTOCOL
+    )
+
+
 def main():
     """CLI entry point."""
-    parser = create_parser()
-    args = parser.parse_args()
-    
-    if not args.command:
-        parser.print_help()
-        return 0
+    args = _parse_fast(sys.argv[1:])
+    if args is None:
+        parser = create_parser()
+        args = parser.parse_args()
+        
+        if not args.command:
+            parser.print_help()
+            return 0
     
-    analyzer = ProtocolAnalyzer(verbose=getattr(args, 'verbose', False))
+    analyzer = ProtocolAnalyzer(
+        verbose=getattr(args, 'verbose', False),
+        jobs=getattr(args, 'jobs', 1),
+        use_cache=not getattr(args, 'no_cache', True),
+        max_file_bytes=getattr(args, 'max_file_size', MAX_FILE_BYTES),
+        max_matches=getattr(args, 'max_matches', MAX_MATCHES_PER_PROTOCOL)
+    )
     
     try:
         if args.command == 'analyze':
-            result = analyzer.analyze(args.project_path, args.requirement)
+            result = analyzer.analyze(
+                args.project_path, args.requirement, refresh=args.refresh
+            )
             
-            if args.format == 'json':
+            if args.format == 'json' and args.output:
+                # Large reports go straight to disk without an in-memory
+                # copy, compact unless --pretty since files are for tools
+                analyzer.write_json(
+                    result, args.output, indent=2 if args.pretty else None
+                )
+                print(f"[OK] Report saved to: {args.output}")
+                return 0
+            elif args.format == 'json':
                 output = analyzer.to_json(result)
             elif args.format == 'markdown':
                 output = analyzer.to_markdown(result)
             else:
-                # Text format
-                output = f"""
+                # Text format - pieces are joined once at the end
+                parts = [f"""
 Protocol Analysis Report
 ========================
 Project: {result.project_path}
@@ -1439,19 +2476,20 @@ Complexity: {result.complexity_total:.1f}
 Summary: {result.summary}
 
 Detected Protocols:
-"""
+"""]
                 for proto in result.detected_protocols:
-                    output += f"  - {proto.name}: {proto.file_count} files, {proto.total_lines} refs, complexity {proto.complexity_score:.1f}\n"
+                    parts.append(f"  - {proto.name}: {proto.file_count} files, {proto.total_lines} refs, complexity {proto.complexity_score:.1f}\n")
                 
                 if result.warnings:
-                    output += "\nWarnings:\n"
+                    parts.append("\nWarnings:\n")
                     for w in result.warnings:
-                        output += f"  [!] {w}\n"
+                        parts.append(f"  [!] {w}\n")
                 
-                output += "\nRecommendations:\n"
+                parts.append("\nRecommendations:\n")
                 for i, rec in enumerate(result.recommendations[:3], 1):
-                    output += f"  {i}. {rec.protocol} (score: {rec.score:.0f}/100)\n"
-                    output += f"     Migration: {rec.migration_complexity}, Est: {rec.estimated_time}\n"
+                    parts.append(f"  {i}. {rec.protocol} (score: {rec.score:.0f}/100)\n")
+                    parts.append(f"     Migration: {rec.migration_complexity}, Est: {rec.estimated_time}\n")
+                output = ''.join(parts)
             
             if args.output:
                 Path(args.output).write_text(output, encoding='utf-8')
@@ -1472,12 +2510,15 @@ Detected Protocols:
         elif args.command == 'list':
             print("\nKnown Protocols:")
             print("=" * 50)
-            for key, info in sorted(PROTOCOLS_DB.items()):
-                if args.category == 'all' or info.category == args.category:
-                    print(f"\n{info.name}")
-                    print(f"  Category: {info.category}")
-                    print(f"  Complexity: {info.complexity_base}/10")
-                    print(f"  Use cases: {', '.join(info.typical_use_cases[:2])}")
+            if args.category == 'all':
+                listed = _SORTED_PROTOCOLS
+            else:
+                listed = _PROTOCOLS_BY_CATEGORY[args.category]
+            for key, info in listed:
+                print(f"\n{info.name}")
+                print(f"  Category: {info.category}")
+                print(f"  Complexity: {info.complexity_base}/10")
+                print(f"  Use cases: {', '.join(info.typical_use_cases[:2])}")
         
         return 0
         
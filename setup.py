@@ -23,6 +23,7 @@ setup(
     extras_require={
         "dev": [
             "pytest>=7.0.0",
+            "pytest-xdist>=3.0.0",
             "mypy>=0.990",
         ],
     },
@@ -12,6 +12,7 @@ Tests cover:
 
 Run: python test_protocolanalyzer.py
 Or:  pytest test_protocolanalyzer.py -v
+Or:  python test_protocolanalyzer.py --parallel  (needs pytest-xdist)
 """
 
 import json
@@ -20,7 +21,6 @@ import sys
 import tempfile
 import unittest
 from pathlib import Path
-from datetime import datetime
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
@@ -30,14 +30,49 @@ from protocolanalyzer import (
     ProtocolDetector,
     ComplexityCalculator,
     RecommendationEngine,
+    CacheStore,
     ProtocolDetection,
     ProjectProtocol,
     ProtocolRecommendation,
     AnalysisResult,
     PROTOCOLS_DB,
-    DETECTION_PATTERNS
+    DETECTION_PATTERNS,
+    MAX_MATCHES_PER_PROTOCOL,
+    calculate_migration_complexity,
+    estimate_migration_time
 )
 
+_saved_tempdir = None
+
+
+def setUpModule():
+    """Create test trees in RAM-backed /dev/shm when it is available."""
+    global _saved_tempdir
+    _saved_tempdir = tempfile.tempdir
+    if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK):
+        tempfile.tempdir = '/dev/shm'
+
+
+def tearDownModule():
+    """Restore the default temp directory."""
+    tempfile.tempdir = _saved_tempdir
+
+
+def _write_fixtures(root, files):
+    """
+    Write fixture files under root in one pass.
+    
+    Text is encoded as UTF-8 up front and each file is written with a single
+    unbuffered os.write, skipping the text-mode file object write_text builds.
+    """
+    for name, content in files.items():
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        fd = os.open(os.path.join(root, name), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+
 
 class TestProtocolDetector(unittest.TestCase):
     """Test protocol detection functionality."""
@@ -45,12 +80,12 @@ class TestProtocolDetector(unittest.TestCase):
     def setUp(self):
         """Set up test fixtures."""
         self.detector = ProtocolDetector()
-        self.temp_dir = tempfile.mkdtemp()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.temp_dir = self._tmp.name
         
     def tearDown(self):
         """Clean up test fixtures."""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        self._tmp.cleanup()
         
     def test_initialization(self):
         """Test detector initializes correctly."""
@@ -155,14 +190,153 @@ source.onmessage = (event) => {
     def test_detect_multiple_protocols(self):
         """Test detecting multiple protocols in same project."""
         # Create files with different protocols
-        (Path(self.temp_dir) / "ws.py").write_text("import websocket\nws = websocket.connect('ws://host')")
-        (Path(self.temp_dir) / "api.py").write_text("import requests\nrequests.get('http://api')")
+        _write_fixtures(self.temp_dir, {
+            "ws.py": "import websocket\nws = websocket.connect('ws://host')",
+            "api.py": "import requests\nrequests.get('http://api')"
+        })
         
         detections = self.detector.scan_project(Path(self.temp_dir))
         
         protocols = set(d.protocol for d in detections)
         self.assertGreater(len(protocols), 1)
         
+    def test_line_number_and_context(self):
+        """Test detections report the matching line and surrounding context."""
+        test_file = Path(self.temp_dir) / "client.py"
+        test_file.write_text("a = 1\nb = 2\nimport grpc\nc = 3\nd = 4\ne = 5\n")
+
+        detections = self.detector.scan_project(Path(self.temp_dir))
+
+        grpc_detections = [d for d in detections if d.protocol == "grpc"]
+        self.assertEqual(len(grpc_detections), 1)
+        self.assertEqual(grpc_detections[0].line_number, 3)
+        self.assertEqual(grpc_detections[0].context, "a = 1\nb = 2\nimport grpc\nc = 3\nd = 4")
+        self.assertEqual(self.detector.file_protocol_lines[(str(test_file), "grpc")], 1)
+
+    def test_pattern_does_not_span_lines(self):
+        """Test a pattern split over two lines is not detected."""
+        test_file = Path(self.temp_dir) / "split.py"
+        test_file.write_text("import\ngrpc\n")
+
+        detections = self.detector.scan_project(Path(self.temp_dir))
+
+        self.assertEqual(len([d for d in detections if d.protocol == "grpc"]), 0)
+
+    def test_anchored_pattern_matches_each_line(self):
+        """Test ^ and $ in a detection pattern anchor at every line."""
+        (Path(self.temp_dir) / "app.py").write_text("x = 1\nimport mybus\ny = mybus\nz = 2\n")
+
+        DETECTION_PATTERNS["mqtt"].extend([(r"^import\s+mybus", 0.9), (r"mybus$", 0.9)])
+        try:
+            detections = self.detector.scan_project(Path(self.temp_dir))
+        finally:
+            del DETECTION_PATTERNS["mqtt"][-2:]
+
+        lines = {(d.pattern_matched, d.line_number) for d in detections}
+        self.assertIn((r"^import\s+mybus", 2), lines)
+        self.assertIn((r"mybus$", 2), lines)
+        self.assertIn((r"mybus$", 3), lines)
+
+    def test_non_ascii_pattern_rejected(self):
+        """Test a non-ASCII detection pattern raises a ValueError naming it."""
+        (Path(self.temp_dir) / "app.py").write_text("import grpc\n")
+
+        DETECTION_PATTERNS["mqtt"].append((r"café\.connect", 0.9))
+        try:
+            with self.assertRaisesRegex(ValueError, "café"):
+                self.detector.scan_project(Path(self.temp_dir))
+        finally:
+            DETECTION_PATTERNS["mqtt"].pop()
+
+    def test_line_bounded_character_classes(self):
+        """Test character classes, negated or not, are kept within one line."""
+        import re
+        import warnings
+        from protocolanalyzer import _line_bounded
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")  # No nested-set FutureWarning
+            in_class = re.compile(_line_bounded(r"import[\s:]+grpc"))
+            negated = re.compile(_line_bounded(r"a[^x]b"))
+
+        self.assertIsNotNone(in_class.search("import: grpc"))
+        self.assertIsNone(in_class.search("import\ngrpc"))
+        self.assertIsNotNone(negated.search("a-b"))
+        self.assertIsNone(negated.search("a\nb"))
+
+        word_break = re.compile(_line_bounded(r"grpc[\W_]+client"))
+        not_digit = re.compile(_line_bounded(r"v[\D.]+x"))
+        self.assertIsNotNone(word_break.search("grpc-_ client"))
+        self.assertIsNone(word_break.search("grpc\nclient"))
+        self.assertIsNotNone(not_digit.search("v.a.x"))
+        self.assertIsNone(not_digit.search("v.\nx"))
+
+    def test_detection_ignores_case(self):
+        """Test patterns match regardless of letter case."""
+        test_file = Path(self.temp_dir) / "app.js"
+        test_file.write_text("const ws = NEW   WEBSOCKET('ws://host');\n")
+
+        detections = self.detector.scan_project(Path(self.temp_dir))
+
+        patterns = {d.pattern_matched for d in detections}
+        self.assertIn(r"new\s+WebSocket\s*\(", patterns)
+
+    def test_added_pattern_used_after_earlier_scan(self):
+        """Test patterns added to DETECTION_PATTERNS apply to later scans."""
+        for i in range(ProtocolDetector.PARALLEL_MIN_FILES):
+            (Path(self.temp_dir) / f"mod{i}.py").write_text("bus = CustomBus()\n")
+        self.detector.scan_project(Path(self.temp_dir))
+
+        DETECTION_PATTERNS["websocket"].append((r"CustomBus\(", 0.9))
+        try:
+            for detector in (ProtocolDetector(), ProtocolDetector(jobs=2)):
+                detections = detector.scan_project(Path(self.temp_dir))
+                self.assertEqual(
+                    len([d for d in detections if d.pattern_matched == r"CustomBus\("]),
+                    ProtocolDetector.PARALLEL_MIN_FILES
+                )
+        finally:
+            DETECTION_PATTERNS["websocket"].pop()
+
+    def test_parallel_scan_matches_sequential(self):
+        """Test scanning with a process pool finds the same detections."""
+        for i in range(ProtocolDetector.PARALLEL_MIN_FILES + 4):
+            (Path(self.temp_dir) / f"mod{i}.py").write_text(
+                f"import websocket\nimport requests\nx = {i}\n"
+            )
+
+        def key(d):
+            return (d.file_path, d.protocol, d.line_number, d.pattern_matched)
+
+        sequential = self.detector.scan_project(Path(self.temp_dir))
+        parallel = ProtocolDetector(jobs=2).scan_project(Path(self.temp_dir))
+
+        self.assertGreater(len(parallel), 0)
+        self.assertEqual(sorted(map(key, sequential)), sorted(map(key, parallel)))
+
+    def test_cache_reuses_unchanged_files(self):
+        """Test cached detections are reused until the file changes."""
+        test_file = Path(self.temp_dir) / "client.py"
+        test_file.write_text("import websocket\n")
+        detector = ProtocolDetector(use_cache=True)
+
+        detector.scan_project(Path(self.temp_dir))
+        cache_file = Path(self.temp_dir) / CacheStore.FILENAME
+        self.assertTrue(cache_file.exists())
+
+        # Tamper with the cached entry to prove the second scan reads it
+        data = json.loads(cache_file.read_text())
+        data["files"][str(test_file)]["detections"][0]["confidence"] = 0.123
+        cache_file.write_text(json.dumps(data))
+        detections = detector.scan_project(Path(self.temp_dir))
+        self.assertEqual(detections[0].confidence, 0.123)
+
+        # A changed file is rescanned
+        test_file.write_text("import websocket\nimport requests\n")
+        detections = detector.scan_project(Path(self.temp_dir))
+        self.assertNotIn(0.123, [d.confidence for d in detections])
+        self.assertIn("http_rest", {d.protocol for d in detections})
+
     def test_skip_node_modules(self):
         """Test that node_modules is skipped."""
         nm_dir = Path(self.temp_dir) / "node_modules" / "some_pkg"
@@ -220,9 +394,10 @@ ws.send("Hello")
 class TestComplexityCalculator(unittest.TestCase):
     """Test complexity calculation."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.calculator = ComplexityCalculator()
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures shared by every test."""
+        cls.calculator = ComplexityCalculator()
         
     def test_initialization(self):
         """Test calculator initializes."""
@@ -302,14 +477,26 @@ class TestComplexityCalculator(unittest.TestCase):
         
         self.assertIn("hour", time_low)
         self.assertTrue("day" in time_high or "week" in time_high)
+        
+    def test_module_functions_match_class(self):
+        """Test the class methods are the module-level functions."""
+        self.assertEqual(
+            self.calculator.calculate_migration_complexity("websocket", "grpc", 3),
+            calculate_migration_complexity("websocket", "grpc", 3)
+        )
+        self.assertEqual(
+            self.calculator.estimate_migration_time("MEDIUM", 5),
+            estimate_migration_time("MEDIUM", 5)
+        )
 
 
 class TestRecommendationEngine(unittest.TestCase):
     """Test recommendation generation."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.engine = RecommendationEngine()
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures shared by every test."""
+        cls.engine = RecommendationEngine()
         
     def test_initialization(self):
         """Test engine initializes."""
@@ -372,25 +559,48 @@ class TestRecommendationEngine(unittest.TestCase):
         scores = [r.score for r in recs]
         self.assertEqual(scores, sorted(scores, reverse=True))
 
+    def test_top_k_matches_sorted_prefix(self):
+        """Test top_k returns the head of the full ranking, ties included."""
+        summary = {'websocket': {'total_matches': 3, 'files': ['a.py']}}
+        for requirement in ("realtime", "rpc", "streaming"):
+            full = self.engine.generate_recommendations(summary, requirement)
+            top = self.engine.generate_recommendations(summary, requirement, top_k=5)
+            self.assertEqual(
+                [r.protocol for r in top],
+                [r.protocol for r in full[:5]]
+            )
+
 
 class TestProtocolAnalyzer(unittest.TestCase):
     """Test main analyzer functionality."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Share one analyzer; each scan starts from a clean detector."""
+        cls.analyzer = ProtocolAnalyzer()
+        
     def setUp(self):
         """Set up test fixtures."""
-        self.analyzer = ProtocolAnalyzer()
-        self.temp_dir = tempfile.mkdtemp()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.temp_dir = self._tmp.name
         
     def tearDown(self):
         """Clean up."""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        self._tmp.cleanup()
         
     def test_initialization(self):
         """Test analyzer initializes."""
         analyzer = ProtocolAnalyzer()
         self.assertIsNotNone(analyzer)
         
+    def test_helper_attributes_kept(self):
+        """Test the calculator and engine attributes from 1.0 still exist."""
+        self.assertIsInstance(self.analyzer.complexity_calc, ComplexityCalculator)
+        self.assertIsInstance(self.analyzer.recommender, RecommendationEngine)
+        self.assertIsInstance(
+            self.analyzer.recommender.complexity_calc, ComplexityCalculator
+        )
+
     def test_initialization_verbose(self):
         """Test analyzer initializes with verbose flag."""
         analyzer = ProtocolAnalyzer(verbose=True)
@@ -424,6 +634,45 @@ def connect():
         with self.assertRaises(FileNotFoundError):
             self.analyzer.analyze("/nonexistent/path/12345")
             
+    def test_cached_result_reused_until_tree_changes(self):
+        """Test an unchanged project returns the cached result."""
+        test_file = Path(self.temp_dir) / "client.py"
+        test_file.write_text("import websocket\n")
+        analyzer = ProtocolAnalyzer(use_cache=True)
+
+        first = analyzer.analyze(self.temp_dir)
+        second = analyzer.analyze(self.temp_dir)
+        self.assertEqual(analyzer.to_json(second), analyzer.to_json(first))
+        self.assertEqual(second.timestamp, first.timestamp)
+
+        # --refresh recomputes the same analysis
+        refreshed = analyzer.analyze(self.temp_dir, refresh=True)
+        self.assertNotEqual(refreshed.timestamp, first.timestamp)
+        self.assertEqual(refreshed.detected_protocols, first.detected_protocols)
+
+        # A changed file invalidates the cached result
+        test_file.write_text("import websocket\nimport requests\n")
+        changed = analyzer.analyze(self.temp_dir)
+        self.assertIn("http_rest", [p.name for p in changed.detected_protocols])
+
+    def test_malformed_cache_entries_are_misses(self):
+        """Test hand-edited cache entries are rescanned instead of failing."""
+        test_file = Path(self.temp_dir) / "client.py"
+        test_file.write_text("import websocket\n")
+        analyzer = ProtocolAnalyzer(use_cache=True)
+        first = analyzer.analyze(self.temp_dir)
+
+        cache_file = Path(self.temp_dir) / CacheStore.FILENAME
+        data = json.loads(cache_file.read_text())
+        del data["files"][str(test_file)]["detections"][0]["pattern_matched"]
+        del data["result"]["data"]["detected_protocols"][0]["name"]
+        cache_file.write_text(json.dumps(data))
+
+        result = analyzer.analyze(self.temp_dir)
+        self.assertEqual(result.detected_protocols, first.detected_protocols)
+        data = json.loads(cache_file.read_text())
+        self.assertIn("pattern_matched", data["files"][str(test_file)]["detections"][0])
+
     def test_result_has_recommendations(self):
         """Test result includes recommendations."""
         result = self.analyzer.analyze(self.temp_dir)
@@ -450,6 +699,20 @@ def connect():
         self.assertIn("pros", ws_data)
         self.assertIn("cons", ws_data)
         
+    def test_determine_architecture(self):
+        """Test architecture type from client/server flags."""
+        def proto(is_client, is_server):
+            return ProjectProtocol("websocket", [], 1, 1, 10.0, is_client, is_server)
+        
+        cases = [
+            ([], "unknown"),
+            ([proto(True, False)], "frontend"),
+            ([proto(False, True)], "backend"),
+            ([proto(True, False), proto(False, True)], "full-stack"),
+        ]
+        for protocols, expected in cases:
+            self.assertEqual(self.analyzer._determine_architecture(protocols), expected)
+        
     def test_compare_unknown_protocol(self):
         """Test comparing unknown protocol."""
         comparison = self.analyzer.compare_protocols(["unknown_proto_xyz"])
@@ -467,6 +730,13 @@ def connect():
         self.assertIn("steps", guide)
         self.assertIsInstance(guide["steps"], list)
         
+    def test_migration_guide_accepts_aliases(self):
+        """Test migration guide resolves underscore and display-name spellings."""
+        guide = self.analyzer.get_migration_guide("Socket_IO", "HTTP Long-Polling")
+        
+        self.assertEqual(guide["from"], "Socket.IO")
+        self.assertEqual(guide["to"], "HTTP Long-Polling")
+        
     def test_migration_guide_unknown_from(self):
         """Test migration with unknown source."""
         guide = self.analyzer.get_migration_guide("unknown_proto", "websocket")
@@ -489,6 +759,38 @@ def connect():
         self.assertIsInstance(parsed, dict)
         self.assertIn("project_path", parsed)
         
+    def test_to_json_compact(self):
+        """Test compact JSON holds the same data without whitespace."""
+        result = self.analyzer.analyze(self.temp_dir)
+        compact = self.analyzer.to_json(result, indent=None)
+        
+        self.assertNotIn("\n", compact)
+        self.assertEqual(json.loads(compact), json.loads(self.analyzer.to_json(result)))
+        
+    def test_write_json_matches_to_json(self):
+        """Test JSON files match the in-memory export, indented and compact."""
+        result = self.analyzer.analyze(self.temp_dir)
+        out_path = Path(self.temp_dir) / "report.json"
+        for indent in (2, None):
+            self.analyzer.write_json(result, str(out_path), indent=indent)
+            
+            self.assertEqual(
+                out_path.read_text(encoding='utf-8'),
+                self.analyzer.to_json(result, indent=indent)
+            )
+
+    def test_to_json_matches_asdict(self):
+        """Test JSON export has exactly the dataclass fields, in order."""
+        from dataclasses import asdict
+
+        (Path(self.temp_dir) / "app.py").write_text("import websocket\nimport requests\n")
+        result = self.analyzer.analyze(self.temp_dir)
+
+        self.assertEqual(
+            self.analyzer.to_json(result),
+            json.dumps(asdict(result), indent=2)
+        )
+
     def test_to_markdown(self):
         """Test Markdown export."""
         result = self.analyzer.analyze(self.temp_dir)
@@ -541,12 +843,12 @@ class TestEdgeCases(unittest.TestCase):
     
     def setUp(self):
         """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.temp_dir = self._tmp.name
         
     def tearDown(self):
         """Clean up."""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        self._tmp.cleanup()
         
     def test_binary_file_handling(self):
         """Test handling of binary files."""
@@ -558,14 +860,53 @@ class TestEdgeCases(unittest.TestCase):
         detections = detector.scan_project(Path(self.temp_dir))
         self.assertIsInstance(detections, list)
         
+    def test_skip_binary_source_file(self):
+        """Test a NUL byte near the start marks a source file as binary."""
+        (Path(self.temp_dir) / "blob.js").write_bytes(b"\x00\x01import websocket\n")
+
+        detections = ProtocolDetector().scan_project(Path(self.temp_dir))
+        self.assertEqual(len(detections), 0)
+
+    def test_skip_minified_file(self):
+        """Test files with a very long line near the start are skipped."""
+        minified = "var a=1;" * 500 + "new WebSocket('ws://host');"
+        (Path(self.temp_dir) / "bundle.min.js").write_text(minified)
+        (Path(self.temp_dir) / "app.js").write_text("new WebSocket('ws://host');\n")
+
+        detections = ProtocolDetector().scan_project(Path(self.temp_dir))
+
+        self.assertGreater(len(detections), 0)
+        self.assertTrue(all(d.file_path.endswith("app.js") for d in detections))
+
+    def test_skip_oversized_file(self):
+        """Test files above the size limit are skipped."""
+        (Path(self.temp_dir) / "big.js").write_text("new WebSocket('ws://host');\n" * 10)
+        (Path(self.temp_dir) / "app.js").write_text("new WebSocket('ws://host');\n")
+
+        detector = ProtocolDetector(max_file_bytes=100)
+        detections = detector.scan_project(Path(self.temp_dir))
+
+        self.assertGreater(len(detections), 0)
+        self.assertTrue(all(d.file_path.endswith("app.js") for d in detections))
+
+    def test_matches_capped_per_protocol(self):
+        """Test a protocol stops being searched after enough matches in a file."""
+        (Path(self.temp_dir) / "vendor.py").write_text("import websocket\n" * 60)
+
+        detections = ProtocolDetector().scan_project(Path(self.temp_dir))
+        self.assertEqual(len(detections), MAX_MATCHES_PER_PROTOCOL)
+
+        # 0 lifts the cap for exact reference counts
+        detections = ProtocolDetector(max_matches=0).scan_project(Path(self.temp_dir))
+        self.assertEqual(len(detections), 60)
+
     def test_unicode_file_handling(self):
         """Test handling of Unicode content."""
-        unicode_file = Path(self.temp_dir) / "test.py"
-        unicode_file.write_text("""
+        _write_fixtures(self.temp_dir, {"test.py": """
 # Файл с юникодом
 import websocket  # вебсокет
 ws = websocket.connect('ws://example.com')
-""", encoding='utf-8')
+"""})
         
         detector = ProtocolDetector()
         detections = detector.scan_project(Path(self.temp_dir))
@@ -627,19 +968,58 @@ ws = websocket.connect('ws://example.com')
         detections = detector.scan_project(Path(self.temp_dir))
         self.assertIsInstance(detections, list)
 
+    def test_symlink_directory_cycle(self):
+        """Test a symlink pointing back up the tree is not followed."""
+        sub_dir = Path(self.temp_dir) / "sub"
+        sub_dir.mkdir()
+        (sub_dir / "real.py").write_text("import websocket")
+        try:
+            (sub_dir / "loop").symlink_to(Path(self.temp_dir), target_is_directory=True)
+        except (OSError, NotImplementedError):
+            self.skipTest("Symlinks not supported on this system")
+
+        detector = ProtocolDetector()
+        detections = detector.scan_project(Path(self.temp_dir))
+
+        self.assertEqual(len({d.file_path for d in detections}), 1)
+
+    def test_deeply_nested_directories(self):
+        """Test trees nested deeper than the recursion limit are walked."""
+        deep_dir = self.temp_dir
+        try:
+            try:
+                for _ in range(1100):
+                    deep_dir = os.path.join(deep_dir, "d")
+                    os.mkdir(deep_dir)
+                Path(deep_dir, "app.py").write_text("import websocket\n")
+            except OSError:
+                self.skipTest("Path too long for this system")
+
+            detections = ProtocolDetector().scan_project(Path(self.temp_dir))
+
+            self.assertEqual(len(detections), 1)
+        finally:
+            # Temp dir cleanup in tearDown recurses too, so remove bottom-up
+            if os.path.exists(os.path.join(deep_dir, "app.py")):
+                os.remove(os.path.join(deep_dir, "app.py"))
+            while deep_dir != self.temp_dir:
+                if os.path.isdir(deep_dir):
+                    os.rmdir(deep_dir)
+                deep_dir = os.path.dirname(deep_dir)
+
 
 class TestIntegration(unittest.TestCase):
     """Integration tests for complete workflows."""
     
     def setUp(self):
         """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.temp_dir = self._tmp.name
         self.analyzer = ProtocolAnalyzer()
         
     def tearDown(self):
         """Clean up."""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        self._tmp.cleanup()
         
     def test_full_workflow(self):
         """Test complete analysis workflow."""
@@ -647,7 +1027,8 @@ class TestIntegration(unittest.TestCase):
         src = Path(self.temp_dir) / "src"
         src.mkdir()
         
-        (src / "server.py").write_text("""
+        _write_fixtures(src, {
+            "server.py": """
 import socketio
 
 sio = socketio.AsyncServer()
@@ -659,9 +1040,8 @@ async def connect(sid, environ):
 @sio.event
 async def disconnect(sid):
     print(f'Disconnected: {sid}')
-""")
-        
-        (src / "api.py").write_text("""
+""",
+            "api.py": """
 import requests
 
 def fetch_data(url):
@@ -670,9 +1050,8 @@ def fetch_data(url):
     
 def post_data(url, data):
     return requests.post(url, json=data)
-""")
-        
-        (src / "client.js").write_text("""
+""",
+            "client.js": """
 const io = require('socket.io-client');
 const socket = io('http://localhost:3000');
 
@@ -680,7 +1059,8 @@ socket.on('connect', () => {
     console.log('Connected!');
     socket.emit('message', 'Hello');
 });
-""")
+"""
+        })
         
         # Run analysis
         result = self.analyzer.analyze(self.temp_dir)
@@ -731,6 +1111,13 @@ socket.on('connect', () => {
 class TestCLI(unittest.TestCase):
     """Test CLI functionality."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Build the parser once for every parsing test."""
+        from protocolanalyzer import create_parser
+        
+        cls.parser = create_parser()
+        
     def test_parser_creation(self):
         """Test argument parser creates correctly."""
         from protocolanalyzer import create_parser
@@ -740,19 +1127,25 @@ class TestCLI(unittest.TestCase):
         
     def test_parser_analyze_command(self):
         """Test analyze command parsing."""
-        from protocolanalyzer import create_parser
-        
-        parser = create_parser()
+        parser = self.parser
         args = parser.parse_args(['analyze', '/some/path'])
         
         self.assertEqual(args.command, 'analyze')
         self.assertEqual(args.project_path, '/some/path')
         
+    def test_fast_path_matches_parser(self):
+        """Test the argparse-free analyze path yields the parser's defaults."""
+        from protocolanalyzer import _parse_fast
+        
+        parser = self.parser
+        argv = ['analyze', '/some/path']
+        
+        self.assertEqual(vars(_parse_fast(argv)), vars(parser.parse_args(argv)))
+        self.assertIsNone(_parse_fast(argv + ['--format', 'json']))
+        
     def test_parser_compare_command(self):
         """Test compare command parsing."""
-        from protocolanalyzer import create_parser
-        
-        parser = create_parser()
+        parser = self.parser
         args = parser.parse_args(['compare', 'websocket', 'socket.io'])
         
         self.assertEqual(args.command, 'compare')
@@ -760,9 +1153,7 @@ class TestCLI(unittest.TestCase):
         
     def test_parser_migrate_command(self):
         """Test migrate command parsing."""
-        from protocolanalyzer import create_parser
-        
-        parser = create_parser()
+        parser = self.parser
         args = parser.parse_args(['migrate', 'socket.io', 'websocket'])
         
         self.assertEqual(args.command, 'migrate')
@@ -771,26 +1162,32 @@ class TestCLI(unittest.TestCase):
         
     def test_parser_list_command(self):
         """Test list command parsing."""
-        from protocolanalyzer import create_parser
-        
-        parser = create_parser()
+        parser = self.parser
         args = parser.parse_args(['list'])
         
         self.assertEqual(args.command, 'list')
         
     def test_parser_format_options(self):
         """Test format options."""
-        from protocolanalyzer import create_parser
-        
-        parser = create_parser()
+        parser = self.parser
         
         for fmt in ['json', 'markdown', 'text']:
             args = parser.parse_args(['analyze', '/path', '--format', fmt])
             self.assertEqual(args.format, fmt)
 
 
-def run_tests():
-    """Run all tests with nice output."""
+def run_tests(parallel=False):
+    """Run all tests with nice output, or across CPUs with pytest-xdist."""
+    if parallel:
+        from importlib.util import find_spec
+        
+        # find_spec rather than import, so pytest can still assert-rewrite
+        # the plugin when it loads it
+        if find_spec('pytest') and find_spec('xdist'):
+            import pytest
+            return int(pytest.main(['-n', 'auto', __file__]))
+        print("[!] pytest-xdist not installed, running tests serially")
+    
     print("=" * 70)
     print("TESTING: ProtocolAnalyzer v1.0")
     print("=" * 70)
@@ -829,4 +1226,4 @@ def run_tests():
 
 
 if __name__ == "__main__":
-    sys.exit(run_tests())
+    sys.exit(run_tests(parallel=bool({'-p', '--parallel'} & set(sys.argv[1:]))))